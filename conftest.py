@@ -1,13 +1,24 @@
 """Pytest configuration and shared fixtures."""
 
 import pytest
+from pathlib import Path
 from unittest.mock import Mock
 from sonarcloud_github_sync.config import Config
-from sonarcloud_github_sync.sonar_client import SonarIssue
-from sonarcloud_github_sync.github_client import GitHubIssue
+from sonarcloud_github_sync.sonar_client import SonarClient, SonarIssue
+from sonarcloud_github_sync.github_client import GitHubClient, GitHubIssue
+from sonarcloud_github_sync.sync import SyncEngine
 
 
-@pytest.fixture
+FIXTURES_DIR = Path(__file__).parent / "tests" / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def github_issues_page1():
+    """Provide a full 100-issue list-issues page as raw JSON bytes."""
+    return (FIXTURES_DIR / "github_issues_page1.json").read_bytes()
+
+
+@pytest.fixture(scope="session")
 def sample_config():
     """Provide a sample configuration for tests."""
     return Config(
@@ -19,10 +30,56 @@ def sample_config():
     )
 
 
+@pytest.fixture(scope="class")
+def config():
+    """Provide the configuration used by the sync engine and integration tests.
+    
+    Shared per test class; SyncEngine only reads its config.
+    """
+    return Config(
+        sonar_token="test-sonar-token",
+        github_token="test-github-token",
+        sonar_project_key="test-project",
+        github_repo="owner/repo",
+        issue_types=["BUG", "VULNERABILITY"]
+    )
+
+
+@pytest.fixture
+def make_engine(config):
+    """Provide a factory for SyncEngines built from the shared config.
+    
+    Call it after mocking the clients, since SyncEngine creates them on construction.
+    """
+    def _make_engine(dry_run=False):
+        return SyncEngine(config, dry_run=dry_run)
+    return _make_engine
+
+
+@pytest.fixture(scope="class")
+def engine(config):
+    """Provide a SyncEngine for tests of its pure helpers, shared per test class."""
+    return SyncEngine(config)
+
+
 @pytest.fixture
+def mocked_clients(monkeypatch):
+    """Make SyncEngine use mock clients that pass credential validation.
+    
+    Returns the (sonar, github) mocks the engine will be built with.
+    """
+    sonar, github = Mock(), Mock()
+    sonar.test_connection.return_value = True
+    github.test_connection.return_value = True
+    monkeypatch.setattr("sonarcloud_github_sync.sync.SonarClient", lambda *args, **kwargs: sonar)
+    monkeypatch.setattr("sonarcloud_github_sync.sync.GitHubClient", lambda *args, **kwargs: github)
+    return sonar, github
+
+
+@pytest.fixture(scope="session")
 def sample_sonar_issue():
     """Provide a sample SonarCloud issue for tests."""
-    return SonarIssue(
+    return SonarIssue.model_construct(
         key="test-issue-1",
         type="BUG",
         severity="MAJOR",
@@ -30,19 +87,19 @@ def sample_sonar_issue():
         message="Test issue message",
         component="src/test.py",
         project="test-project",
-        tags=["test", "example"]
+        tags=("test", "example")
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_github_issue():
     """Provide a sample GitHub issue for tests."""
-    return GitHubIssue(
+    return GitHubIssue.model_construct(
         number=123,
         title="Test GitHub Issue",
         body="**SonarCloud Issue:** test-issue-1\nTest body content",
         state="open",
-        labels=["sonarcloud", "bug"],
+        labels=("sonarcloud", "bug"),
         state_reason=None
     )
 
@@ -50,21 +107,21 @@ def sample_github_issue():
 @pytest.fixture
 def mock_sonar_client():
     """Provide a mock SonarCloud client."""
-    mock = Mock()
+    mock = Mock(spec=SonarClient)
     mock.test_connection.return_value = True
     mock.get_issues.return_value = []
     mock.resolve_issue_as_wont_fix.return_value = True
+    mock.resolve_issues_as_wont_fix.return_value = 0
     return mock
 
 
 @pytest.fixture
 def mock_github_client():
     """Provide a mock GitHub client."""
-    mock = Mock()
+    mock = Mock(spec=GitHubClient)
     mock.test_connection.return_value = True
     mock.get_issues_with_label.return_value = []
-    mock.issue_exists_with_sonar_link.return_value = None
-    mock.create_issue.return_value = GitHubIssue(
+    mock.create_issue.return_value = GitHubIssue.model_construct(
         number=1, title="Test", body="", state="open"
     )
     mock.close_issue.return_value = True
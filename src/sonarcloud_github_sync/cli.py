@@ -3,8 +3,6 @@
 import sys
 from typing import List, Optional
 import click
-from .config import Config
-from .sync import SyncEngine
 from .logging_config import setup_logging, get_logger
 
 
@@ -29,6 +27,16 @@ from .logging_config import setup_logging, get_logger
     is_flag=True,
     help="Show what would be done without making any changes"
 )
+@click.option(
+    "--cache-dir",
+    default=None,
+    help="Directory for caching GitHub issue listings between runs (e.g., ~/.cache/sonarcloud-github-sync)"
+)
+@click.option(
+    "--sequential",
+    is_flag=True,
+    help="Close GitHub issues and resolve SonarCloud issues one at a time instead of concurrently"
+)
 @click.option(
     "--debug",
     is_flag=True,
@@ -41,7 +49,7 @@ from .logging_config import setup_logging, get_logger
     help="Set the logging level (default: INFO)"
 )
 @click.version_option()
-def main(sonar_project: str, github_repo: str, issue_types: str, dry_run: bool, debug: bool, log_level: str):
+def main(sonar_project: str, github_repo: str, issue_types: str, dry_run: bool, cache_dir: Optional[str], sequential: bool, debug: bool, log_level: str):
     """Synchronize issues between SonarCloud and GitHub.
     
     This tool creates GitHub issues for SonarCloud issues and maintains
@@ -63,11 +71,15 @@ def main(sonar_project: str, github_repo: str, issue_types: str, dry_run: bool,
         sonarcloud-github-sync --sonar-project my-org_my-project --github-repo myorg/myrepo --dry-run
     """
     
+    # Deferred so --help and --version don't pay for importing requests and pydantic
+    from .config import Config
+    from .sync import SyncEngine
+    
     try:
         # Setup logging
         logger = setup_logging(level=log_level, debug=debug)
         logger.info("Starting SonarCloud-GitHub sync tool")
-        logger.debug(f"CLI arguments: sonar_project={sonar_project}, github_repo={github_repo}, issue_types={issue_types}, dry_run={dry_run}, debug={debug}, log_level={log_level}")
+        logger.debug(f"CLI arguments: sonar_project={sonar_project}, github_repo={github_repo}, issue_types={issue_types}, dry_run={dry_run}, cache_dir={cache_dir}, sequential={sequential}, debug={debug}, log_level={log_level}")
         
         # Parse issue types
         issue_type_list = [t.strip().upper() for t in issue_types.split(",")]
@@ -77,14 +89,16 @@ def main(sonar_project: str, github_repo: str, issue_types: str, dry_run: bool,
         config = Config.from_env(
             sonar_project_key=sonar_project,
             github_repo=github_repo,
-            issue_types=issue_type_list
+            issue_types=issue_type_list,
+            cache_dir=cache_dir,
+            concurrency=1 if sequential else None
         )
         logger.debug(f"Configuration created: project={config.sonar_project_key}, repo={config.github_repo}, types={config.issue_types}")
         
         # Create sync engine and run
         logger.info("Initializing sync engine")
-        sync_engine = SyncEngine(config, dry_run=dry_run)
-        results = sync_engine.full_sync()
+        with SyncEngine(config, dry_run=dry_run) as sync_engine:
+            results = sync_engine.full_sync()
         
         # Report results
         logger.info("Sync operation completed")
@@ -2,7 +2,10 @@
 
 import os
 from typing import List, Optional
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Issue types accepted by the SonarCloud issues search
+VALID_ISSUE_TYPES = frozenset({"BUG", "VULNERABILITY", "CODE_SMELL"})
 
 
 class Config(BaseModel):
@@ -13,9 +16,28 @@ class Config(BaseModel):
     sonar_project_key: str
     github_repo: str
     issue_types: List[str] = ["BUG", "VULNERABILITY", "CODE_SMELL"]
+    cache_dir: Optional[str] = None
+    concurrency: int = Field(default=8, ge=1)
+    page_size: int = Field(default=100, ge=1, le=100)
+    
+    @field_validator("issue_types")
+    @classmethod
+    def _check_issue_types(cls, value: List[str]) -> List[str]:
+        """Reject issue types SonarCloud doesn't know about."""
+        unknown = [issue_type for issue_type in value if issue_type not in VALID_ISSUE_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown issue types: {', '.join(unknown)} (expected any of {', '.join(sorted(VALID_ISSUE_TYPES))})")
+        return value
     
     @classmethod
-    def from_env(cls, sonar_project_key: str, github_repo: str, issue_types: Optional[List[str]] = None) -> "Config":
+    def from_env(
+        cls,
+        sonar_project_key: str,
+        github_repo: str,
+        issue_types: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        concurrency: Optional[int] = None
+    ) -> "Config":
         """Create config from environment variables."""
         sonar_token = os.getenv("SONAR_TOKEN")
         github_token = os.getenv("GITHUB_TOKEN")
@@ -24,11 +46,15 @@ class Config(BaseModel):
             raise ValueError("SONAR_TOKEN environment variable is required")
         if not github_token:
             raise ValueError("GITHUB_TOKEN environment variable is required")
-            
+        
+        # Only pass concurrency when given, so the field default stays the single source
+        overrides = {} if concurrency is None else {"concurrency": concurrency}
         return cls(
             sonar_token=sonar_token,
             github_token=github_token,
             sonar_project_key=sonar_project_key,
             github_repo=github_repo,
-            issue_types=issue_types or ["BUG", "VULNERABILITY", "CODE_SMELL"]
+            issue_types=issue_types or ["BUG", "VULNERABILITY", "CODE_SMELL"],
+            cache_dir=cache_dir,
+            **overrides
         )
\ No newline at end of file
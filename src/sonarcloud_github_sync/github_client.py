@@ -1,28 +1,129 @@
 """GitHub API client."""
 
-from typing import List, Dict, Any, Optional
+import operator
+import os
+import re
+import shelve
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
 import requests
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator
 from .logging_config import get_logger
 
 
+# Maximum number of issue pages fetched in parallel
+MAX_PAGE_WORKERS = 8
+# Largest page GitHub serves for issue listings
+MAX_PAGE_SIZE = 100
+# Warn when fewer API requests than this remain in the current rate-limit window
+RATE_LIMIT_WARNING_THRESHOLD = 500
+
+# Extracts the SonarCloud issue key from the "**SonarCloud Issue:** <key>" body marker
+_SONAR_MARKER_KEY_RE = re.compile(r"\*\*SonarCloud Issue:\*\* ([A-Za-z0-9_:-]+)")
+
+# Extracts the SonarCloud issue key from the issues= parameter of a SonarCloud issue URL
+_SONAR_URL_KEY_RE = re.compile(r"sonarcloud\.io/project/issues\?(?:[^\s&]*&)*?issues=([A-Za-z0-9_:-]+)")
+_LABEL_NAME = operator.itemgetter("name")
+
+
+def extract_sonar_key(text: str) -> Optional[str]:
+    """Extract the SonarCloud issue key from the "**SonarCloud Issue:** <key>" body marker."""
+    match = _SONAR_MARKER_KEY_RE.search(text)
+    return match.group(1) if match else None
+
+
+def extract_sonar_url_key(text: str) -> Optional[str]:
+    """Extract the SonarCloud issue key from a SonarCloud issue URL."""
+    match = _SONAR_URL_KEY_RE.search(text)
+    return match.group(1) if match else None
+
+
+class GitHubError(Exception):
+    """Raised when a GitHub API request fails."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 class GitHubIssue(BaseModel):
     """Represents a GitHub issue."""
     
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     number: int
     title: str
     body: str
     state: str
-    labels: List[str] = []
+    labels: Tuple[str, ...] = ()
     state_reason: Optional[str] = None
+    
+    @field_validator("body", mode="before")
+    @classmethod
+    def _default_body(cls, value: Any) -> Any:
+        """Treat a null body from the API as empty."""
+        return "" if value is None else value
+    
+    @field_validator("labels", mode="before")
+    @classmethod
+    def _label_names(cls, value: Any) -> Any:
+        """Accept label objects from the API and keep only their names."""
+        if value is None:
+            return ()
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return tuple(map(_LABEL_NAME, value))
+        return value
+    
+    @field_validator("labels")
+    @classmethod
+    def _intern_labels(cls, value: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Intern label names so labels repeated across issues share one string."""
+        return tuple(map(sys.intern, value))
+
+
+# Decodes and validates a whole page of issues in a single pass, built once at import time
+_GITHUB_ISSUES_ADAPTER = TypeAdapter(List[GitHubIssue])
+
+# Decodes issue event lists with pydantic-core's JSON parser instead of the stdlib one
+_ISSUE_EVENTS_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+
+def index_by_sonar_key(
+    issues: Iterable[GitHubIssue], marker_keys: Optional[Sequence[Optional[str]]] = None
+) -> Dict[str, GitHubIssue]:
+    """Index GitHub issues by the SonarCloud issue key in their body, keeping the first per key.
+    
+    Bodies without the marker are indexed by their SonarCloud link. This is only
+    meant for duplicate checks, where a looser match at worst skips a creation.
+    Pass ``marker_keys``, aligned with ``issues``, when the marker keys were
+    already extracted so the bodies aren't parsed again.
+    """
+    if marker_keys is None:
+        pairs: Iterable[Tuple[Optional[str], GitHubIssue]] = (
+            (extract_sonar_key(issue.body), issue) for issue in issues
+        )
+    else:
+        pairs = zip(marker_keys, issues)
+    index: Dict[str, GitHubIssue] = {}
+    for marker_key, issue in pairs:
+        sonar_key = marker_key or extract_sonar_url_key(issue.body)
+        if sonar_key and sonar_key not in index:
+            index[sonar_key] = issue
+    return index
 
 
 class GitHubClient:
     """Client for interacting with GitHub API."""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, cache_dir: Optional[str] = None, page_size: int = MAX_PAGE_SIZE):
         self.token = token
         self.base_url = "https://api.github.com"
+        self.page_size = page_size
         self.logger = get_logger(__name__)
         self.session = requests.Session()
         self.session.headers.update({
@@ -30,54 +131,161 @@ class GitHubClient:
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "SonarCloud-GitHub-Sync/1.0"
         })
+        self.session.headers["Connection"] = "keep-alive"
+        # Size the connection pool for concurrent requests and retry transient failures.
+        # POST is left out of the retried methods so issue creation is never duplicated.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["HEAD", "GET", "PATCH"],
+                # Rate-limited responses say how long to wait, honour that over the backoff
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        # Existing issues indexed by SonarCloud issue key, built lazily for _index_repo
+        self._sonar_index: Dict[str, GitHubIssue] = {}
+        self._index_repo: Optional[str] = None
+        # Issue list pages keyed by request URL, revalidated with ETags across runs
+        self._page_cache: Optional[shelve.Shelf] = None
+        self._page_cache_lock = threading.Lock()
+        if cache_dir:
+            cache_dir = os.path.expanduser(cache_dir)
+            os.makedirs(cache_dir, exist_ok=True)
+            self._page_cache = shelve.open(os.path.join(cache_dir, "github_issue_pages"))
+            self.logger.debug(f"Using GitHub issue page cache in {cache_dir}")
         
         self.logger.debug("GitHub client initialized")
     
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+        if self._page_cache is not None:
+            self._page_cache.close()
+            self._page_cache = None
+    
+    def __enter__(self) -> "GitHubClient":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _request(
+        self, method: str, url: str, error_message: str, log_error: bool = True, **kwargs: Any
+    ) -> requests.Response:
+        """Send a request and raise GitHubError if it fails or returns an error status."""
+        try:
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            if log_error:
+                self.logger.error(f"{error_message}: {e}")
+            status_code = e.response.status_code if e.response is not None else None
+            raise GitHubError(f"{error_message}: {e}", status_code) from e
+    
     def get_issues_with_label(self, repo: str, label: str = "sonarcloud") -> List[GitHubIssue]:
         """Fetch GitHub issues with a specific label."""
+        issues = list(self.iter_issues_with_label(repo, label))
+        self.logger.debug(f"Retrieved {len(issues)} GitHub issues with label '{label}'")
+        return issues
+    
+    def iter_issues_with_label(self, repo: str, label: str = "sonarcloud") -> Iterator[GitHubIssue]:
+        """Yield GitHub issues with a specific label, one page at a time."""
         self.logger.debug(f"Fetching GitHub issues for repo {repo} with label '{label}'")
         url = f"{self.base_url}/repos/{repo}/issues"
         params = {
             "labels": label,
             "state": "all",
-            "per_page": 100
+            "per_page": self.page_size
         }
         
-        try:
-            issues = []
+        page_issues, links = self._fetch_issues_page(url, params, 1)
+        yield from page_issues
+        
+        last_page = self._get_last_page(links)
+        if last_page > 1:
+            # Total page count is known up front, fetch the remaining pages concurrently
+            self.logger.debug(f"Fetching pages 2-{last_page} of GitHub issues concurrently")
+            workers = min(MAX_PAGE_WORKERS, last_page - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for page_issues, _ in executor.map(
+                    lambda page: self._fetch_issues_page(url, params, page),
+                    range(2, last_page + 1)
+                ):
+                    yield from page_issues
+        else:
+            # No last page advertised, follow rel="next" until GitHub stops sending it
             page = 1
-            
-            while True:
-                params["page"] = page
-                self.logger.debug(f"Fetching page {page} of GitHub issues")
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data:
-                    break
-                
-                for issue_data in data:
-                    issue = GitHubIssue(
-                        number=issue_data["number"],
-                        title=issue_data["title"],
-                        body=issue_data.get("body", ""),
-                        state=issue_data["state"],
-                        labels=[label["name"] for label in issue_data.get("labels", [])],
-                        state_reason=issue_data.get("state_reason")
-                    )
-                    issues.append(issue)
-                
-                if len(data) < 100:
-                    break
+            while "next" in links:
                 page += 1
-            
-            self.logger.debug(f"Retrieved {len(issues)} GitHub issues with label '{label}'")
-            return issues
-            
-        except requests.RequestException as e:
-            self.logger.error(f"Failed to fetch GitHub issues for repo {repo}: {e}")
-            raise Exception(f"Failed to fetch GitHub issues: {e}")
+                page_issues, links = self._fetch_issues_page(url, params, page)
+                yield from page_issues
+    
+    def _fetch_issues_page(
+        self, url: str, params: Dict[str, Any], page: int
+    ) -> Tuple[List[GitHubIssue], Dict[str, Dict[str, str]]]:
+        """Fetch a single page of issues from the GitHub list-issues endpoint.
+        
+        Returns:
+            The page's issues and the parsed Link header of the response
+        """
+        self.logger.debug(f"Fetching page {page} of GitHub issues")
+        page_params = {**params, "page": page}
+        cache_key = f"{url}?{urlencode(page_params)}"
+        cached = self._get_cached_page(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        
+        response = self._request(
+            "GET", url, "Failed to fetch GitHub issues", params=page_params, headers=headers
+        )
+        
+        if response.status_code == 304 and cached:
+            # Not modified, and conditional requests don't count against the rate limit
+            self.logger.debug(f"Page {page} of GitHub issues not modified, using cached copy")
+            _, content, links = cached
+        else:
+            content, links = response.content, response.links
+            etag = response.headers.get("ETag")
+            if etag:
+                self._store_cached_page(cache_key, (etag, content, links))
+        return _GITHUB_ISSUES_ADAPTER.validate_json(content), links
+    
+    def _get_cached_page(self, cache_key: str) -> Optional[Tuple[str, bytes, Dict[str, Dict[str, str]]]]:
+        """Get the cached ETag, body and links of an issue list page."""
+        if self._page_cache is None:
+            return None
+        with self._page_cache_lock:
+            return self._page_cache.get(cache_key)
+    
+    def _store_cached_page(self, cache_key: str, entry: Tuple[str, bytes, Dict[str, Dict[str, str]]]) -> None:
+        """Store the ETag, body and links of an issue list page."""
+        if self._page_cache is None:
+            return
+        with self._page_cache_lock:
+            self._page_cache[cache_key] = entry
+    
+    def _invalidate_cached_pages(self, repo: str) -> None:
+        """Drop cached issue list pages of a repo after it was modified."""
+        if self._page_cache is None:
+            return
+        prefix = f"{self.base_url}/repos/{repo}/issues?"
+        with self._page_cache_lock:
+            for cache_key in [key for key in self._page_cache.keys() if key.startswith(prefix)]:
+                del self._page_cache[cache_key]
+    
+    @staticmethod
+    def _get_last_page(links: Dict[str, Dict[str, str]]) -> int:
+        """Get the last page number from a parsed Link header."""
+        last_url = links.get("last", {}).get("url")
+        if not last_url:
+            return 1
+        return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
     
     def create_issue(self, repo: str, title: str, body: str, labels: List[str] = None) -> GitHubIssue:
         """Create a new GitHub issue."""
@@ -90,24 +298,16 @@ class GitHubClient:
         }
         self.logger.debug(f"Issue data: title={title}, labels={labels}")
         
-        try:
-            response = self.session.post(url, json=data)
-            response.raise_for_status()
-            issue_data = response.json()
-            
-            created_issue = GitHubIssue(
-                number=issue_data["number"],
-                title=issue_data["title"],
-                body=issue_data.get("body", ""),
-                state=issue_data["state"],
-                labels=[label["name"] for label in issue_data.get("labels", [])]
-            )
-            self.logger.debug(f"Successfully created GitHub issue #{created_issue.number}")
-            return created_issue
-            
-        except requests.RequestException as e:
-            self.logger.error(f"Failed to create GitHub issue in repo {repo}: {e}")
-            raise Exception(f"Failed to create GitHub issue: {e}")
+        response = self._request("POST", url, "Failed to create GitHub issue", json=data)
+        created_issue = GitHubIssue.model_validate_json(response.content)
+        self.logger.debug(f"Successfully created GitHub issue #{created_issue.number}")
+        self._invalidate_cached_pages(repo)
+        
+        if self._index_repo == repo:
+            sonar_key = extract_sonar_key(body) or extract_sonar_url_key(body)
+            if sonar_key:
+                self._sonar_index[sonar_key] = created_issue
+        return created_issue
     
     def close_issue(self, repo: str, issue_number: int) -> bool:
         """Close a GitHub issue."""
@@ -115,43 +315,60 @@ class GitHubClient:
         url = f"{self.base_url}/repos/{repo}/issues/{issue_number}"
         data = {"state": "closed"}
         
-        try:
-            response = self.session.patch(url, json=data)
-            response.raise_for_status()
-            self.logger.debug(f"Successfully closed GitHub issue #{issue_number}")
-            return True
-        except requests.RequestException as e:
-            self.logger.error(f"Failed to close GitHub issue #{issue_number} in repo {repo}: {e}")
-            raise Exception(f"Failed to close GitHub issue #{issue_number}: {e}")
+        self._request("PATCH", url, f"Failed to close GitHub issue #{issue_number}", json=data)
+        self.logger.debug(f"Successfully closed GitHub issue #{issue_number}")
+        self._invalidate_cached_pages(repo)
+        
+        if self._index_repo == repo:
+            for sonar_key, issue in self._sonar_index.items():
+                if issue.number == issue_number:
+                    self._sonar_index[sonar_key] = issue.model_copy(update={"state": "closed"})
+                    break
+        return True
     
     def get_issue_events(self, repo: str, issue_number: int) -> List[Dict[str, Any]]:
         """Get events for a GitHub issue to determine close reason."""
         url = f"{self.base_url}/repos/{repo}/issues/{issue_number}/events"
         
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            raise Exception(f"Failed to get events for GitHub issue #{issue_number}: {e}")
+        response = self._request("GET", url, f"Failed to get events for GitHub issue #{issue_number}")
+        return _ISSUE_EVENTS_ADAPTER.validate_json(response.content)
     
     def issue_exists_with_sonar_link(self, repo: str, sonar_issue_url: str) -> Optional[GitHubIssue]:
         """Check if a GitHub issue already exists for a SonarCloud issue."""
-        issues = self.get_issues_with_label(repo, "sonarcloud")
-        for issue in issues:
-            if sonar_issue_url in issue.body:
-                return issue
-        return None
+        sonar_key = extract_sonar_url_key(sonar_issue_url)
+        if not sonar_key:
+            return None
+        return self.sonar_key_index(repo).get(sonar_key)
+    
+    def sonar_key_index(self, repo: str) -> Dict[str, GitHubIssue]:
+        """Get the repo's labeled issues indexed by SonarCloud issue key.
+        
+        The index is built from a single fetch and kept up to date by
+        create_issue and close_issue, so callers can look up keys directly.
+        """
+        if self._index_repo != repo:
+            self._build_sonar_index(repo)
+        return self._sonar_index
+    
+    def _build_sonar_index(self, repo: str) -> None:
+        """Fetch the labeled issues once and index them by SonarCloud issue key."""
+        self.logger.debug(f"Building SonarCloud issue index for repo {repo}")
+        self._sonar_index = index_by_sonar_key(self.iter_issues_with_label(repo, "sonarcloud"))
+        self._index_repo = repo
     
     def test_connection(self, repo: str) -> bool:
         """Test if the GitHub connection is working."""
         self.logger.debug(f"Testing GitHub connection for repo {repo}")
         url = f"{self.base_url}/repos/{repo}"
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            self.logger.debug(f"GitHub connection test successful for repo {repo}")
-            return True
-        except requests.RequestException as e:
-            self.logger.debug(f"GitHub connection test failed for repo {repo}: {e}")
-            return False
\ No newline at end of file
+            # HEAD checks access and rate limit without transferring the repository body
+            response = self._request("HEAD", url, "GitHub connection test failed", log_error=False)
+        except GitHubError as e:
+            self.logger.debug(f"{e} (repo {repo})")
+            return False
+        
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and int(remaining) < RATE_LIMIT_WARNING_THRESHOLD:
+            self.logger.warning(f"Only {remaining} GitHub API requests remain in the current rate-limit window")
+        self.logger.debug(f"GitHub connection test successful for repo {repo}")
+        return True
\ No newline at end of file
@@ -2,12 +2,29 @@
 
 import logging
 import sys
-from typing import Optional
+from typing import Optional, Tuple
+
+
+# Formatters are immutable, so build them once
+_DEBUG_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+_DEFAULT_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%H:%M:%S'
+)
+
+# Settings and console handler of the last setup_logging call
+_configured: Optional[Tuple[int, bool]] = None
+_console_handler: Optional[logging.StreamHandler] = None
 
 
 def setup_logging(level: str = "INFO", debug: bool = False) -> logging.Logger:
     """Set up logging configuration.
     
+    Repeated calls with the same settings are no-ops.
+    
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         debug: If True, enables debug mode with more detailed output
@@ -15,45 +32,39 @@ def setup_logging(level: str = "INFO", debug: bool = False) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    global _configured, _console_handler
+    
     # Set level based on debug flag or explicit level
     if debug:
         log_level = logging.DEBUG
     else:
         log_level = getattr(logging, level.upper(), logging.INFO)
     
-    # Create formatter
-    if debug:
-        # More detailed format for debug mode
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    else:
-        # Simpler format for normal operation
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
-    
-    # Configure root logger
+    # Skip reconfiguring if nothing changed and the handler still targets the current stdout
     root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    
-    # Remove existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    if (
+        _configured == (log_level, debug)
+        and _console_handler in root_logger.handlers
+        and _console_handler.stream is sys.stdout
+    ):
+        return logging.getLogger('sonarcloud_github_sync')
     
-    # Create console handler
+    # Create console handler, more detailed format for debug mode
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(_DEBUG_FORMATTER if debug else _DEFAULT_FORMATTER)
+    
+    # Configure root logger, replacing any existing handlers
+    logging.basicConfig(level=log_level, handlers=[console_handler], force=True)
     
     # Reduce noise from external libraries unless in debug mode
     if not debug:
         logging.getLogger('urllib3').setLevel(logging.WARNING)
         logging.getLogger('requests').setLevel(logging.WARNING)
     
+    _configured = (log_level, debug)
+    _console_handler = console_handler
+    
     # Return logger for the package
     return logging.getLogger('sonarcloud_github_sync')
 
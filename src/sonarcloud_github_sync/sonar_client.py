@@ -1,14 +1,43 @@
 """SonarCloud API client."""
 
-from typing import List, Dict, Any
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import requests
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from .logging_config import get_logger
 
 
+# Bound str.format of the SonarCloud issue URL, resolved once at import time
+_SONAR_URL_TEMPLATE = "https://sonarcloud.io/project/issues?id={project}&issues={key}&open={key}".format
+
+# Maximum number of issue pages fetched in parallel, kept low for SonarCloud rate limits
+MAX_PAGE_WORKERS = 4
+
+# SonarCloud refuses to page past this many results for a single search
+MAX_SEARCH_RESULTS = 10000
+
+# Maximum number of issues accepted by a single bulk_change request
+MAX_BULK_CHANGE_ISSUES = 500
+
+
+class SonarCloudError(Exception):
+    """Raised when a SonarCloud API request fails."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 class SonarIssue(BaseModel):
     """Represents a SonarCloud issue."""
     
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     key: str
     type: str
     severity: str
@@ -16,12 +45,40 @@ class SonarIssue(BaseModel):
     message: str
     component: str
     project: str
-    tags: List[str] = []
+    tags: Tuple[str, ...] = ()
     
-    @property
+    @field_validator("tags")
+    @classmethod
+    def _intern_tags(cls, value: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Intern tags so tags repeated across issues share one string."""
+        return tuple(map(sys.intern, value))
+    
+    @cached_property
     def url(self) -> str:
         """Generate the SonarCloud issue URL."""
-        return f"https://sonarcloud.io/project/issues?id={self.project}&issues={self.key}&open={self.key}"
+        return _SONAR_URL_TEMPLATE(project=self.project, key=self.key)
+
+
+class _SonarPaging(BaseModel):
+    """Paging block of the issues/search response."""
+    
+    page_size: int = Field(alias="pageSize")
+    total: int
+
+
+class _SonarSearchResponse(BaseModel):
+    """Shape of the issues/search response body that the client reads."""
+    
+    issues: List[SonarIssue] = []
+    paging: Optional[_SonarPaging] = None
+
+
+class _SonarBulkChangeResponse(BaseModel):
+    """Shape of the issues/bulk_change response body that the client reads."""
+    
+    success: int = 0
+    failures: int = 0
+    ignored: int = 0
 
 
 class SonarClient:
@@ -33,11 +90,59 @@ class SonarClient:
         self.logger = get_logger(__name__)
         self.session = requests.Session()
         self.session.auth = (token, "")
+        self.session.headers["Connection"] = "keep-alive"
+        # Size the connection pool for concurrent requests and retry transient failures.
+        # POST is left out of the retried methods: a transition the server already
+        # applied would fail on retry and be reported as an error.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["GET"],
+                # Rate-limited responses say how long to wait, honour that over the backoff
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
         
         self.logger.debug("SonarCloud client initialized")
     
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "SonarClient":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _request(
+        self, method: str, url: str, error_message: str, log_error: bool = True, **kwargs: Any
+    ) -> requests.Response:
+        """Send a request and raise SonarCloudError if it fails or returns an error status."""
+        try:
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            if log_error:
+                self.logger.error(f"{error_message}: {e}")
+            status_code = e.response.status_code if e.response is not None else None
+            raise SonarCloudError(f"{error_message}: {e}", status_code) from e
+    
     def get_issues(self, project_key: str, issue_types: List[str] = None) -> List[SonarIssue]:
         """Fetch issues from SonarCloud project."""
+        issues = list(self.iter_issues(project_key, issue_types))
+        self.logger.debug(f"Retrieved {len(issues)} SonarCloud issues")
+        return issues
+    
+    def iter_issues(self, project_key: str, issue_types: Optional[List[str]] = None) -> Iterator[SonarIssue]:
+        """Yield issues from SonarCloud project, one page at a time."""
         self.logger.debug(f"Fetching SonarCloud issues for project {project_key} with types {issue_types}")
         url = f"{self.base_url}/issues/search"
         params = {
@@ -50,32 +155,41 @@ class SonarClient:
             params["types"] = ",".join(issue_types)
             self.logger.debug(f"Filtering by issue types: {issue_types}")
         
-        try:
-            self.logger.debug(f"Making API request to SonarCloud: {url}")
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            issues = []
-            for issue_data in data.get("issues", []):
-                issue = SonarIssue(
-                    key=issue_data["key"],
-                    type=issue_data["type"],
-                    severity=issue_data["severity"],
-                    status=issue_data["status"],
-                    message=issue_data["message"],
-                    component=issue_data["component"],
-                    project=issue_data["project"],
-                    tags=issue_data.get("tags", [])
-                )
-                issues.append(issue)
-            
-            self.logger.debug(f"Retrieved {len(issues)} SonarCloud issues")
-            return issues
-            
-        except requests.RequestException as e:
-            self.logger.error(f"Failed to fetch SonarCloud issues for project {project_key}: {e}")
-            raise Exception(f"Failed to fetch SonarCloud issues: {e}")
+        first_page = self._fetch_issues_page(url, params, 1)
+        yield from first_page.issues
+        
+        page_count = self._get_page_count(first_page.paging)
+        if page_count > 1:
+            # Total is known from the first page, fetch the remaining pages concurrently
+            self.logger.debug(f"Fetching pages 2-{page_count} of SonarCloud issues concurrently")
+            workers = min(MAX_PAGE_WORKERS, page_count - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for page in executor.map(
+                    lambda page_number: self._fetch_issues_page(url, params, page_number),
+                    range(2, page_count + 1)
+                ):
+                    yield from page.issues
+    
+    def _fetch_issues_page(self, url: str, params: Dict[str, Any], page: int) -> _SonarSearchResponse:
+        """Fetch a single page of the SonarCloud issues search."""
+        self.logger.debug(f"Making API request to SonarCloud: {url} (page {page})")
+        response = self._request(
+            "GET", url, "Failed to fetch SonarCloud issues", params={**params, "p": page}
+        )
+        # Decode and validate the body in a single pass
+        return _SonarSearchResponse.model_validate_json(response.content)
+    
+    def _get_page_count(self, paging: Optional[_SonarPaging]) -> int:
+        """Get the number of search pages from the paging block of the first page."""
+        if paging is None or paging.page_size <= 0:
+            return 1
+        total = paging.total
+        if total > MAX_SEARCH_RESULTS:
+            self.logger.warning(
+                f"SonarCloud reports {total} issues but only the first {MAX_SEARCH_RESULTS} can be fetched"
+            )
+            total = MAX_SEARCH_RESULTS
+        return max(1, math.ceil(total / paging.page_size))
     
     def resolve_issue_as_wont_fix(self, issue_key: str) -> bool:
         """Mark a SonarCloud issue as 'Won't Fix'."""
@@ -86,22 +200,41 @@ class SonarClient:
             "transition": "wontfix"
         }
         
-        try:
-            response = self.session.post(url, data=data)
-            response.raise_for_status()
-            self.logger.debug(f"Successfully marked SonarCloud issue {issue_key} as 'Won't Fix'")
-            return True
-        except requests.RequestException as e:
-            self.logger.error(f"Failed to resolve SonarCloud issue {issue_key}: {e}")
-            raise Exception(f"Failed to resolve SonarCloud issue {issue_key}: {e}")
+        self._request("POST", url, f"Failed to resolve SonarCloud issue {issue_key}", data=data)
+        self.logger.debug(f"Successfully marked SonarCloud issue {issue_key} as 'Won't Fix'")
+        return True
+    
+    def resolve_issues_as_wont_fix(self, issue_keys: List[str]) -> int:
+        """Mark up to MAX_BULK_CHANGE_ISSUES SonarCloud issues as 'Won't Fix' with one bulk_change request.
+        
+        Returns:
+            The number of issues SonarCloud reports as transitioned
+        """
+        self.logger.debug(f"Marking {len(issue_keys)} SonarCloud issues as 'Won't Fix'")
+        url = f"{self.base_url}/issues/bulk_change"
+        data = {
+            "issues": ",".join(issue_keys),
+            "do_transition": "wontfix"
+        }
+        response = self._request("POST", url, "Failed to bulk resolve SonarCloud issues", data=data)
+        result = _SonarBulkChangeResponse.model_validate_json(response.content)
+        
+        if result.success < len(issue_keys):
+            # bulk_change only reports counts, so name the keys of the whole request
+            self.logger.warning(
+                f"SonarCloud marked {result.success} of {len(issue_keys)} issues as 'Won't Fix' "
+                f"({result.failures} failed, {result.ignored} ignored): {', '.join(issue_keys)}"
+            )
+        else:
+            self.logger.debug(f"SonarCloud marked {result.success} of {len(issue_keys)} issues as 'Won't Fix'")
+        return result.success
     
     def test_connection(self) -> bool:
         """Test if the SonarCloud connection is working."""
         self.logger.debug("Testing SonarCloud connection")
         url = f"{self.base_url}/authentication/validate"
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
+            response = self._request("GET", url, "SonarCloud connection test failed", log_error=False)
             data = response.json()
             is_valid = data.get("valid", False)
             if is_valid:
@@ -109,6 +242,6 @@ class SonarClient:
             else:
                 self.logger.debug("SonarCloud connection test failed: invalid credentials")
             return is_valid
-        except requests.RequestException as e:
-            self.logger.debug(f"SonarCloud connection test failed: {e}")
+        except (SonarCloudError, requests.RequestException) as e:
+            self.logger.debug(str(e))
             return False
\ No newline at end of file
@@ -1,13 +1,18 @@
 """Core synchronization logic between SonarCloud and GitHub."""
 
-import re
-from typing import List, Optional
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
 from .config import Config
-from .sonar_client import SonarClient, SonarIssue
-from .github_client import GitHubClient, GitHubIssue
+from .sonar_client import MAX_BULK_CHANGE_ISSUES, SonarClient, SonarIssue
+from .github_client import GitHubClient, GitHubIssue, extract_sonar_key, index_by_sonar_key
 from .logging_config import get_logger
 
 
+class CredentialError(Exception):
+    """Raised when SonarCloud or GitHub credentials fail validation."""
+
+
 class SyncEngine:
     """Handles synchronization between SonarCloud and GitHub."""
     
@@ -16,122 +21,157 @@ class SyncEngine:
         self.dry_run = dry_run
         self.logger = get_logger(__name__)
         self.sonar_client = SonarClient(config.sonar_token)
-        self.github_client = GitHubClient(config.github_token)
+        self.github_client = GitHubClient(
+            config.github_token,
+            cache_dir=config.cache_dir,
+            page_size=config.page_size
+        )
         
         self.logger.debug(f"SyncEngine initialized with dry_run={dry_run}")
         self.logger.debug(f"Config: project={config.sonar_project_key}, repo={config.github_repo}, types={config.issue_types}")
     
+    def close(self) -> None:
+        """Close both clients, flushing the GitHub page cache to disk."""
+        try:
+            self.sonar_client.close()
+        finally:
+            self.github_client.close()
+    
+    def __enter__(self) -> "SyncEngine":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
     def validate_credentials(self) -> bool:
         """Validate that credentials work for both services."""
         self.logger.debug("Validating SonarCloud credentials")
         if not self.sonar_client.test_connection():
             self.logger.error("SonarCloud credential validation failed")
-            raise Exception("Invalid SonarCloud credentials or connection failed")
+            raise CredentialError("Invalid SonarCloud credentials or connection failed")
         
         self.logger.debug("Validating GitHub credentials and repository access")
         if not self.github_client.test_connection(self.config.github_repo):
             self.logger.error(f"GitHub credential validation failed for repo: {self.config.github_repo}")
-            raise Exception("Invalid GitHub credentials or repository access failed")
+            raise CredentialError("Invalid GitHub credentials or repository access failed")
         
         self.logger.info("All credentials validated successfully")
         return True
     
-    def sync_sonar_to_github(self) -> dict:
-        """Sync SonarCloud issues to GitHub."""
-        self.logger.info(f"Starting SonarCloud to GitHub sync for project: {self.config.sonar_project_key}")
-        self.logger.debug(f"Filtering by issue types: {self.config.issue_types}")
+    def sync_sonar_to_github(self, github_issues: Optional[List[GitHubIssue]] = None) -> dict:
+        """Sync SonarCloud issues to GitHub.
+        
+        Uses ``github_issues`` as the existing sonarcloud-labeled issues if given,
+        otherwise fetches them.
+        """
+        logger = self.logger
+        repo = self.config.github_repo
+        github_client = self.github_client
+        dry_run = self.dry_run
         
-        self.logger.info(f"Fetching issues from SonarCloud project: {self.config.sonar_project_key}")
+        logger.info(f"Starting SonarCloud to GitHub sync for project: {self.config.sonar_project_key}")
+        logger.debug(f"Filtering by issue types: {self.config.issue_types}")
+        
+        logger.info(f"Fetching issues from SonarCloud project: {self.config.sonar_project_key}")
         sonar_issues = self.sonar_client.get_issues(
             self.config.sonar_project_key, 
             self.config.issue_types
         )
         
-        self.logger.info(f"Retrieved {len(sonar_issues)} issues from SonarCloud")
-        self.logger.debug(f"Issue keys: {[issue.key for issue in sonar_issues]}")
-        self.logger.info(f"Found {len(sonar_issues)} issues in SonarCloud")
+        logger.info(f"Retrieved {len(sonar_issues)} issues from SonarCloud")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Issue keys: %s", [issue.key for issue in sonar_issues])
         
         created_count = 0
         skipped_count = 0
         closed_count = 0
         
+        # Fetch existing GitHub issues once and index them by SonarCloud issue key
+        if github_issues is None:
+            github_issues = github_client.get_issues_with_label(repo, "sonarcloud")
+        logger.info(f"Found {len(github_issues)} GitHub issues with 'sonarcloud' label")
+        # Each body's marker is parsed once; the keys are reused by the closure pass below
+        github_issue_keys = [self._extract_sonar_issue_key(github_issue.body) for github_issue in github_issues]
+        # Duplicates also match issues without the marker by their SonarCloud link
+        existing_by_key = index_by_sonar_key(github_issues, github_issue_keys)
+        
         # Create GitHub issues for new SonarCloud issues
-        self.logger.debug("Checking for existing GitHub issues and creating new ones")
+        logger.debug("Checking for existing GitHub issues and creating new ones")
         total_issues = len(sonar_issues)
         for idx, sonar_issue in enumerate(sonar_issues, start=1):
-            self.logger.info(f"[{idx}/{total_issues}] Processing SonarCloud issue: {sonar_issue.key} - {sonar_issue.message[:50]}...")
+            logger.info(f"[{idx}/{total_issues}] Processing SonarCloud issue: {sonar_issue.key} - {sonar_issue.message[:50]}...")
             
-            existing_github_issue = self.github_client.issue_exists_with_sonar_link(
-                self.config.github_repo, 
-                sonar_issue.url
-            )
+            existing_github_issue = existing_by_key.get(sonar_issue.key)
             
             if existing_github_issue:
-                self.logger.debug(f"Found existing GitHub issue #{existing_github_issue.number} for SonarCloud issue {sonar_issue.key}")
-                self.logger.info(f"[{idx}/{total_issues}] Skipping duplicate for SonarCloud issue {sonar_issue.key}")
+                logger.debug("Found existing GitHub issue #%s for SonarCloud issue %s", existing_github_issue.number, sonar_issue.key)
+                logger.info(f"[{idx}/{total_issues}] Skipping duplicate for SonarCloud issue {sonar_issue.key}")
                 skipped_count += 1
                 continue
             
             # Create GitHub issue
             github_title = sonar_issue.message
             github_body = self._create_github_issue_body(sonar_issue)
-            github_labels = ["sonarcloud"] + sonar_issue.tags
+            github_labels = ["sonarcloud", *sonar_issue.tags]
             
-            self.logger.debug(f"Preparing to create GitHub issue for {sonar_issue.key}")
-            self.logger.debug(f"Title: {github_title}")
-            self.logger.debug(f"Labels: {github_labels}")
+            logger.debug("Preparing to create GitHub issue for %s", sonar_issue.key)
+            logger.debug("Title: %s", github_title)
+            logger.debug("Labels: %s", github_labels)
             
-            if self.dry_run:
-                self.logger.info(f"[{idx}/{total_issues}] [DRY RUN] Would create GitHub issue for SonarCloud issue {sonar_issue.key}")
-                self.logger.info(f"  Title: {github_title}")
-                self.logger.info(f"  Labels: {', '.join(github_labels)}")
+            if dry_run:
+                logger.info(f"[{idx}/{total_issues}] [DRY RUN] Would create GitHub issue for SonarCloud issue {sonar_issue.key}")
+                logger.info(f"  Title: {github_title}")
+                logger.info(f"  Labels: {', '.join(github_labels)}")
                 created_count += 1
-            else:
-                try:
-                    self.logger.debug(f"Making API call to create GitHub issue for {sonar_issue.key}")
-                    github_issue = self.github_client.create_issue(
-                        self.config.github_repo,
-                        github_title,
-                        github_body,
-                        github_labels
-                    )
-                    self.logger.info(f"Successfully created GitHub issue #{github_issue.number} for SonarCloud issue {sonar_issue.key}")
-                    self.logger.info(f"[{idx}/{total_issues}] Created GitHub issue #{github_issue.number} for SonarCloud issue {sonar_issue.key}")
-                    created_count += 1
-                except Exception as e:
-                    self.logger.error(f"Failed to create GitHub issue for {sonar_issue.key}: {e}")
-                    self.logger.info(f"[{idx}/{total_issues}] Failed to create GitHub issue for {sonar_issue.key}: {e}")
+                continue
+            
+            # Issues are created one at a time: GitHub rate-limits concurrent content
+            # creation, and serial requests keep issue numbers in SonarCloud order
+            try:
+                github_issue = github_client.create_issue(repo, github_title, github_body, github_labels)
+                logger.info(f"[{idx}/{total_issues}] Created GitHub issue #{github_issue.number} for SonarCloud issue {sonar_issue.key}")
+                created_count += 1
+            except Exception as e:
+                logger.error(f"[{idx}/{total_issues}] Failed to create GitHub issue for {sonar_issue.key}: {e}")
         
         # Check for SonarCloud issues that are now resolved and close corresponding GitHub issues
-        self.logger.info("Checking for resolved SonarCloud issues to close corresponding GitHub issues")
-        github_issues = self.github_client.get_issues_with_label(self.config.github_repo, "sonarcloud")
-        self.logger.info(f"Found {len(github_issues)} GitHub issues with 'sonarcloud' label")
-        
+        logger.info("Checking for resolved SonarCloud issues to close corresponding GitHub issues")
+        open_sonar_keys = {si.key for si in sonar_issues}
         total_github_issues = len(github_issues)
-        for idx, github_issue in enumerate(github_issues, start=1):
-            if github_issue.state == "open":
-                sonar_issue_key = self._extract_sonar_issue_key(github_issue.body)
-                self.logger.info(f"[{idx}/{total_github_issues}] Processing open GitHub issue #{github_issue.number}, linked to SonarCloud issue: {sonar_issue_key}")
-
-                if sonar_issue_key:
-                    # Check if this SonarCloud issue still exists and is open
-                    if not any(si.key == sonar_issue_key for si in sonar_issues):
-                        self.logger.debug(f"SonarCloud issue {sonar_issue_key} no longer open, closing GitHub issue #{github_issue.number}")
-                        if self.dry_run:
-                            self.logger.info(f"[{idx}/{total_github_issues}] [DRY RUN] Would close GitHub issue #{github_issue.number} (SonarCloud issue {sonar_issue_key} resolved)")
-                            closed_count += 1
-                        else:
-                            try:
-                                self.logger.debug(f"Making API call to close GitHub issue #{github_issue.number}")
-                                self.github_client.close_issue(self.config.github_repo, github_issue.number)
-                                self.logger.info(f"Successfully closed GitHub issue #{github_issue.number} (SonarCloud issue {sonar_issue_key} resolved)")
-                                self.logger.info(f"[{idx}/{total_github_issues}] Closed GitHub issue #{github_issue.number} (SonarCloud issue {sonar_issue_key} resolved)")
-                                closed_count += 1
-                            except Exception as e:
-                                self.logger.error(f"Failed to close GitHub issue #{github_issue.number}: {e}")
-                                self.logger.info(f"[{idx}/{total_github_issues}] Failed to close GitHub issue #{github_issue.number}: {e}")
-                else:
-                    self.logger.warning(f"Could not extract SonarCloud issue key from GitHub issue #{github_issue.number}")
+        to_close = []
+        for idx, (sonar_issue_key, github_issue) in enumerate(zip(github_issue_keys, github_issues), start=1):
+            if github_issue.state != "open":
+                continue
+            
+            logger.info(f"[{idx}/{total_github_issues}] Processing open GitHub issue #{github_issue.number}, linked to SonarCloud issue: {sonar_issue_key}")
+            
+            if not sonar_issue_key:
+                logger.warning(f"Could not extract SonarCloud issue key from GitHub issue #{github_issue.number}")
+                continue
+            
+            # Check if this SonarCloud issue still exists and is open
+            if sonar_issue_key in open_sonar_keys:
+                continue
+            
+            logger.debug("SonarCloud issue %s no longer open, closing GitHub issue #%s", sonar_issue_key, github_issue.number)
+            if dry_run:
+                logger.info(f"[{idx}/{total_github_issues}] [DRY RUN] Would close GitHub issue #{github_issue.number} (SonarCloud issue {sonar_issue_key} resolved)")
+                closed_count += 1
+                continue
+            
+            to_close.append((idx, sonar_issue_key, github_issue.number))
+        
+        # Close the collected GitHub issues concurrently, reporting in issue order
+        if to_close:
+            logger.debug("Making API calls to close %d GitHub issues", len(to_close))
+            futures = self._submit_concurrently(github_client.close_issue, [(repo, number) for _, _, number in to_close])
+            for (idx, sonar_issue_key, number), future in zip(to_close, futures):
+                try:
+                    future.result()
+                    logger.info(f"[{idx}/{total_github_issues}] Closed GitHub issue #{number} (SonarCloud issue {sonar_issue_key} resolved)")
+                    closed_count += 1
+                except Exception as e:
+                    logger.error(f"[{idx}/{total_github_issues}] Failed to close GitHub issue #{number}: {e}")
         
         return {
             "created": created_count,
@@ -139,42 +179,72 @@ class SyncEngine:
             "closed": closed_count
         }
     
-    def sync_github_to_sonar(self) -> dict:
-        """Sync GitHub issue closures back to SonarCloud."""
-        self.logger.info("Starting GitHub to SonarCloud sync")
-        self.logger.info("Checking GitHub issues for SonarCloud sync")
+    def sync_github_to_sonar(self, github_issues: Optional[List[GitHubIssue]] = None) -> dict:
+        """Sync GitHub issue closures back to SonarCloud.
         
-        github_issues = self.github_client.get_issues_with_label(self.config.github_repo, "sonarcloud")
-        self.logger.debug(f"Found {len(github_issues)} GitHub issues with 'sonarcloud' label for reverse sync")
+        Uses ``github_issues`` as the sonarcloud-labeled issues if given,
+        otherwise fetches them.
+        """
+        logger = self.logger
+        sonar_client = self.sonar_client
+        dry_run = self.dry_run
+        
+        logger.info("Starting GitHub to SonarCloud sync")
+        
+        if github_issues is None:
+            github_issues = self.github_client.get_issues_with_label(self.config.github_repo, "sonarcloud")
+        logger.debug("Found %d GitHub issues with 'sonarcloud' label for reverse sync", len(github_issues))
         marked_wont_fix = 0
+        to_resolve = []
         
         total_github_issues = len(github_issues)
         for idx, github_issue in enumerate(github_issues, start=1):
-            self.logger.debug(f"Processing GitHub issue #{github_issue.number}, state: {github_issue.state}, state_reason: {github_issue.state_reason}")
+            logger.debug("Processing GitHub issue #%s, state: %s, state_reason: %s", github_issue.number, github_issue.state, github_issue.state_reason)
             
             if github_issue.state == "closed" and github_issue.state_reason == "not_planned":
                 sonar_issue_key = self._extract_sonar_issue_key(github_issue.body)
-                self.logger.debug(f"GitHub issue #{github_issue.number} closed as 'not_planned', linked to SonarCloud issue: {sonar_issue_key}")
+                logger.debug("GitHub issue #%s closed as 'not_planned', linked to SonarCloud issue: %s", github_issue.number, sonar_issue_key)
                 
                 if sonar_issue_key:
-                    if self.dry_run:
-                        self.logger.info(f"[{idx}/{total_github_issues}] [DRY RUN] Would mark SonarCloud issue {sonar_issue_key} as 'Won't Fix'")
+                    if dry_run:
+                        logger.info(f"[{idx}/{total_github_issues}] [DRY RUN] Would mark SonarCloud issue {sonar_issue_key} as 'Won't Fix'")
                         marked_wont_fix += 1
                     else:
-                        try:
-                            self.logger.debug(f"Making API call to mark SonarCloud issue {sonar_issue_key} as 'Won't Fix'")
-                            success = self.sonar_client.resolve_issue_as_wont_fix(sonar_issue_key)
-                            if success:
-                                self.logger.info(f"Successfully marked SonarCloud issue {sonar_issue_key} as 'Won't Fix'")
-                                self.logger.info(f"[{idx}/{total_github_issues}] Marked SonarCloud issue {sonar_issue_key} as 'Won't Fix'")
-                                marked_wont_fix += 1
-                        except Exception as e:
-                            self.logger.error(f"Failed to mark SonarCloud issue {sonar_issue_key} as 'Won't Fix': {e}")
-                            self.logger.info(f"[{idx}/{total_github_issues}] Failed to mark SonarCloud issue {sonar_issue_key} as 'Won't Fix': {e}")
+                        to_resolve.append((idx, sonar_issue_key))
                 else:
-                    self.logger.warning(f"Could not extract SonarCloud issue key from GitHub issue #{github_issue.number}")
+                    logger.warning(f"Could not extract SonarCloud issue key from GitHub issue #{github_issue.number}")
             elif github_issue.state == "closed":
-                self.logger.debug(f"GitHub issue #{github_issue.number} closed as '{github_issue.state_reason}', no action needed")
+                logger.debug("GitHub issue #%s closed as '%s', no action needed", github_issue.number, github_issue.state_reason)
+        
+        # Resolve the collected SonarCloud issues with one bulk request per chunk,
+        # keeping only the chunks whose request failed for the per-issue fallback
+        leftover = []
+        for start in range(0, len(to_resolve), MAX_BULK_CHANGE_ISSUES):
+            chunk = to_resolve[start:start + MAX_BULK_CHANGE_ISSUES]
+            logger.debug("Making bulk API call to mark %d SonarCloud issues as 'Won't Fix'", len(chunk))
+            try:
+                resolved = sonar_client.resolve_issues_as_wont_fix([key for _, key in chunk])
+            except Exception as e:
+                logger.warning(f"Bulk resolution of {len(chunk)} issues failed, falling back to per-issue requests: {e}")
+                leftover.extend(chunk)
+            else:
+                logger.info(f"Marked {resolved} of {len(chunk)} SonarCloud issues as 'Won't Fix'")
+                marked_wont_fix += resolved
+        
+        # Resolve the issues of failed chunks concurrently, reporting in issue order
+        if leftover:
+            futures = self._submit_concurrently(
+                sonar_client.resolve_issue_as_wont_fix,
+                [(sonar_issue_key,) for _, sonar_issue_key in leftover]
+            )
+            for (idx, sonar_issue_key), future in zip(leftover, futures):
+                try:
+                    success = future.result()
+                    if success:
+                        logger.info(f"[{idx}/{total_github_issues}] Marked SonarCloud issue {sonar_issue_key} as 'Won't Fix'")
+                        marked_wont_fix += 1
+                except Exception as e:
+                    logger.error(f"[{idx}/{total_github_issues}] Failed to mark SonarCloud issue {sonar_issue_key} as 'Won't Fix': {e}")
         
         return {
             "marked_wont_fix": marked_wont_fix
@@ -194,18 +264,19 @@ class SyncEngine:
         self.validate_credentials()
         self.logger.info("Credentials validated successfully")
         
+        # Both phases work from the same snapshot of sonarcloud-labeled GitHub issues
+        github_issues = self.github_client.get_issues_with_label(self.config.github_repo, "sonarcloud")
+        
         # Sync SonarCloud -> GitHub
         self.logger.debug("Starting SonarCloud to GitHub sync phase")
-        sonar_to_github_results = self.sync_sonar_to_github()
+        sonar_to_github_results = self.sync_sonar_to_github(github_issues)
         
         # Sync GitHub -> SonarCloud
         self.logger.debug("Starting GitHub to SonarCloud sync phase")
-        github_to_sonar_results = self.sync_github_to_sonar()
+        github_to_sonar_results = self.sync_github_to_sonar(github_issues)
         
-        results = {
-            **sonar_to_github_results,
-            **github_to_sonar_results
-        }
+        results = sonar_to_github_results
+        results.update(github_to_sonar_results)
         
         self.logger.info(f"Sync completed with results: {results}")
         
@@ -226,6 +297,11 @@ class SyncEngine:
         
         return results
     
+    def _submit_concurrently(self, func: Callable[..., Any], calls: List[Tuple[Any, ...]]) -> List[Future]:
+        """Run func once per argument tuple on a thread pool and return the finished futures in call order."""
+        with ThreadPoolExecutor(max_workers=min(self.config.concurrency, len(calls))) as executor:
+            return [executor.submit(func, *args) for args in calls]
+    
     def _create_github_issue_body(self, sonar_issue: SonarIssue) -> str:
         """Create the body text for a GitHub issue from a SonarCloud issue."""
         body_parts = [
@@ -237,19 +313,16 @@ class SyncEngine:
             f"**Description:**",
             sonar_issue.message,
             "",
-            f"**SonarCloud Link:** {sonar_issue.url}",
-            "",
-            "---",
-            "*This issue was automatically created from SonarCloud*"
+            f"**SonarCloud Link:** {sonar_issue.url}"
         ]
         
         if sonar_issue.tags:
-            body_parts.insert(-3, f"**Tags:** {', '.join(sonar_issue.tags)}")
-            body_parts.insert(-3, "")
+            body_parts += [f"**Tags:** {', '.join(sonar_issue.tags)}", ""]
+        
+        body_parts += ["", "---", "*This issue was automatically created from SonarCloud*"]
         
         return "\n".join(body_parts)
     
     def _extract_sonar_issue_key(self, github_body: str) -> Optional[str]:
         """Extract SonarCloud issue key from GitHub issue body."""
-        match = re.search(r'\*\*SonarCloud Issue:\*\* ([A-Za-z0-9_:-]+)', github_body)
-        return match.group(1) if match else None
+        return extract_sonar_key(github_body)
@@ -1,7 +1,9 @@
 """Tests for CLI interface."""
 
+import subprocess
+import sys
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 from click.testing import CliRunner
 from sonarcloud_github_sync.cli import main
 
@@ -9,9 +11,8 @@ from sonarcloud_github_sync.cli import main
 class TestCLI:
     """Test CLI interface."""
     
-    def setup_method(self):
-        """Set up test runner."""
-        self.runner = CliRunner(env={'LC_ALL': 'C.UTF-8', 'LANG': 'C.UTF-8'})
+    # CliRunner keeps no state between invocations, so one runner serves every test
+    runner = CliRunner(env={'LC_ALL': 'C.UTF-8', 'LANG': 'C.UTF-8'})
     
     def test_cli_help(self):
         """Test CLI help message."""
@@ -23,6 +24,15 @@ class TestCLI:
         assert "--issue-types" in result.output
         assert "--dry-run" in result.output
     
+    def test_cli_import_is_lightweight(self):
+        """Test importing the CLI does not pull in requests or pydantic."""
+        code = (
+            "import sys, sonarcloud_github_sync.cli; "
+            "assert 'requests' not in sys.modules and 'pydantic' not in sys.modules"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+    
     def test_cli_missing_required_args(self):
         """Test CLI with missing required arguments."""
         result = self.runner.invoke(main, [])
@@ -33,12 +43,11 @@ class TestCLI:
         'SONAR_TOKEN': 'test-sonar-token',
         'GITHUB_TOKEN': 'test-github-token'
     })
-    @patch('sonarcloud_github_sync.cli.SyncEngine')
+    @patch('sonarcloud_github_sync.sync.SyncEngine')
     def test_cli_successful_sync(self, mock_sync_engine):
         """Test successful CLI execution."""
         # Mock sync engine
-        mock_instance = Mock()
-        mock_sync_engine.return_value = mock_instance
+        mock_instance = mock_sync_engine.return_value.__enter__.return_value
         mock_instance.full_sync.return_value = {
             'created': 5,
             'skipped': 2,
@@ -65,17 +74,18 @@ class TestCLI:
         assert config.sonar_project_key == 'test-project'
         assert config.github_repo == 'owner/repo'
         assert config.issue_types == ['BUG', 'VULNERABILITY', 'CODE_SMELL']
+        assert config.concurrency == 8
         assert kwargs['dry_run'] is False
+        mock_sync_engine.return_value.__exit__.assert_called_once()
     
     @patch.dict('os.environ', {
         'SONAR_TOKEN': 'test-sonar-token',
         'GITHUB_TOKEN': 'test-github-token'
     })
-    @patch('sonarcloud_github_sync.cli.SyncEngine')
+    @patch('sonarcloud_github_sync.sync.SyncEngine')
     def test_cli_with_custom_issue_types(self, mock_sync_engine):
         """Test CLI with custom issue types."""
-        mock_instance = Mock()
-        mock_sync_engine.return_value = mock_instance
+        mock_instance = mock_sync_engine.return_value.__enter__.return_value
         mock_instance.full_sync.return_value = {
             'created': 0, 'skipped': 0, 'closed': 0, 'marked_wont_fix': 0
         }
@@ -97,11 +107,10 @@ class TestCLI:
         'SONAR_TOKEN': 'test-sonar-token',
         'GITHUB_TOKEN': 'test-github-token'
     })
-    @patch('sonarcloud_github_sync.cli.SyncEngine')
+    @patch('sonarcloud_github_sync.sync.SyncEngine')
     def test_cli_dry_run(self, mock_sync_engine):
         """Test CLI dry run mode."""
-        mock_instance = Mock()
-        mock_sync_engine.return_value = mock_instance
+        mock_instance = mock_sync_engine.return_value.__enter__.return_value
         mock_instance.full_sync.return_value = {
             'created': 3, 'skipped': 1, 'closed': 0, 'marked_wont_fix': 1
         }
@@ -120,6 +129,28 @@ class TestCLI:
         args, kwargs = mock_sync_engine.call_args
         assert kwargs['dry_run'] is True
     
+    @patch.dict('os.environ', {
+        'SONAR_TOKEN': 'test-sonar-token',
+        'GITHUB_TOKEN': 'test-github-token'
+    })
+    @patch('sonarcloud_github_sync.sync.SyncEngine')
+    def test_cli_sequential(self, mock_sync_engine):
+        """Test CLI sequential mode limits the sync to a single worker."""
+        mock_instance = mock_sync_engine.return_value.__enter__.return_value
+        mock_instance.full_sync.return_value = {
+            'created': 0, 'skipped': 0, 'closed': 0, 'marked_wont_fix': 0
+        }
+        
+        result = self.runner.invoke(main, [
+            '--sonar-project', 'test-project',
+            '--github-repo', 'owner/repo',
+            '--sequential'
+        ])
+        
+        assert result.exit_code == 0
+        args, kwargs = mock_sync_engine.call_args
+        assert args[0].concurrency == 1
+    
     def test_cli_missing_sonar_token(self):
         """Test CLI with missing SONAR_TOKEN."""
         with patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'}, clear=True):
@@ -148,11 +179,10 @@ class TestCLI:
         'SONAR_TOKEN': 'test-sonar-token',
         'GITHUB_TOKEN': 'test-github-token'
     })
-    @patch('sonarcloud_github_sync.cli.SyncEngine')
+    @patch('sonarcloud_github_sync.sync.SyncEngine')
     def test_cli_sync_error(self, mock_sync_engine):
         """Test CLI handling of sync errors."""
-        mock_instance = Mock()
-        mock_sync_engine.return_value = mock_instance
+        mock_instance = mock_sync_engine.return_value.__enter__.return_value
         mock_instance.full_sync.side_effect = Exception("Sync failed")
         
         result = self.runner.invoke(main, [
@@ -162,6 +192,7 @@ class TestCLI:
         
         assert result.exit_code == 1
         assert "Sync Error: Sync failed" in result.output
+        mock_sync_engine.return_value.__exit__.assert_called_once()
     
     def test_cli_issue_type_parsing(self):
         """Test issue type parsing with different formats."""
@@ -169,9 +200,8 @@ class TestCLI:
             'SONAR_TOKEN': 'test-token',
             'GITHUB_TOKEN': 'test-token'
         }):
-            with patch('sonarcloud_github_sync.cli.SyncEngine') as mock_sync_engine:
-                mock_instance = Mock()
-                mock_sync_engine.return_value = mock_instance
+            with patch('sonarcloud_github_sync.sync.SyncEngine') as mock_sync_engine:
+                mock_instance = mock_sync_engine.return_value.__enter__.return_value
                 mock_instance.full_sync.return_value = {
                     'created': 0, 'skipped': 0, 'closed': 0, 'marked_wont_fix': 0
                 }
@@ -3,6 +3,7 @@
 import os
 import pytest
 from unittest.mock import patch
+from pydantic import ValidationError
 from sonarcloud_github_sync.config import Config
 
 
@@ -35,6 +36,19 @@ class TestConfig:
         )
         
         assert config.issue_types == ["BUG", "VULNERABILITY", "CODE_SMELL"]
+        assert config.concurrency == 8
+        assert config.page_size == 100
+    
+    def test_config_rejects_zero_concurrency(self):
+        """Test concurrency must allow at least one worker."""
+        with pytest.raises(ValidationError):
+            Config(
+                sonar_token="test-sonar-token",
+                github_token="test-github-token",
+                sonar_project_key="test-project",
+                github_repo="owner/repo",
+                concurrency=0
+            )
     
     @patch.dict(os.environ, {
         "SONAR_TOKEN": "env-sonar-token",
@@ -67,6 +81,19 @@ class TestConfig:
         
         assert config.issue_types == ["BUG"]
     
+    @patch.dict(os.environ, {
+        "SONAR_TOKEN": "env-sonar-token",
+        "GITHUB_TOKEN": "env-github-token"
+    })
+    def test_from_env_unknown_issue_type(self):
+        """Test unknown issue types are rejected up front."""
+        with pytest.raises(ValueError, match="Unknown issue types: BUGS"):
+            Config.from_env(
+                sonar_project_key="test-project",
+                github_repo="owner/repo",
+                issue_types=["BUGS", "VULNERABILITY"]
+            )
+    
     @patch.dict(os.environ, {}, clear=True)
     def test_from_env_missing_sonar_token(self):
         """Test error when SONAR_TOKEN is missing."""
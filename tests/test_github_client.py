@@ -1,8 +1,12 @@
 """Tests for GitHub API client."""
 
+import json
+import sys
 import pytest
 import responses
-from sonarcloud_github_sync.github_client import GitHubClient, GitHubIssue
+from responses import matchers
+from unittest.mock import patch
+from sonarcloud_github_sync.github_client import GitHubClient, GitHubError, GitHubIssue
 
 
 class TestGitHubClient:
@@ -46,24 +50,26 @@ class TestGitHubClient:
         assert issues[0].number == 1
         assert issues[0].title == "Test Issue 1"
         assert issues[0].state == "open"
-        assert issues[0].labels == ["sonarcloud", "bug"]
+        assert issues[0].labels == ("sonarcloud", "bug")
+        assert issues[0].labels[0] is sys.intern("sonarcloud")
         assert issues[1].number == 2
         assert issues[1].state == "closed"
         assert issues[1].state_reason == "completed"
     
     @responses.activate
-    def test_get_issues_with_label_pagination(self):
+    def test_get_issues_with_label_pagination(self, github_issues_page1):
         """Test pagination handling."""
         # First page
         responses.add(
             responses.GET,
             "https://api.github.com/repos/owner/repo/issues",
-            json=[{"number": i, "title": f"Issue {i}", "body": "", "state": "open", "labels": []}
-                  for i in range(1, 101)],  # 100 issues
+            body=github_issues_page1,
+            content_type="application/json",
+            headers={"Link": '<https://api.github.com/repos/owner/repo/issues?page=2>; rel="next"'},
             status=200
         )
         
-        # Second page (empty)
+        # Second page (empty, no further Link)
         responses.add(
             responses.GET,
             "https://api.github.com/repos/owner/repo/issues",
@@ -75,18 +81,133 @@ class TestGitHubClient:
         
         assert len(issues) == 100
         assert len(responses.calls) == 2
+        assert "page=2" in responses.calls[1].request.url
     
     @responses.activate
-    def test_get_issues_with_label_error(self):
-        """Test error handling in issue retrieval."""
+    def test_get_issues_with_label_full_page_without_next(self, github_issues_page1):
+        """Test a full page without a next link is treated as the last page."""
         responses.add(
             responses.GET,
             "https://api.github.com/repos/owner/repo/issues",
-            status=404
+            body=github_issues_page1,
+            content_type="application/json",
+            status=200
         )
         
-        with pytest.raises(Exception, match="Failed to fetch GitHub issues"):
-            self.client.get_issues_with_label("owner/repo", "sonarcloud")
+        issues = self.client.get_issues_with_label("owner/repo", "sonarcloud")
+        
+        assert len(issues) == 100
+        assert len(responses.calls) == 1
+    
+    @responses.activate
+    def test_get_issues_with_label_concurrent_pages(self):
+        """Test remaining pages are fetched using the Link header's last page."""
+        url = "https://api.github.com/repos/owner/repo/issues"
+        for page in range(1, 4):
+            responses.add(
+                responses.GET,
+                url,
+                json=[{"number": page, "title": f"Issue {page}", "body": "", "state": "open", "labels": []}],
+                headers={"Link": f'<{url}?page={page + 1}>; rel="next", <{url}?page=3>; rel="last"'},
+                match=[matchers.query_param_matcher({
+                    "labels": "sonarcloud", "state": "all", "per_page": "100", "page": str(page)
+                })],
+                status=200
+            )
+        
+        issues = self.client.get_issues_with_label("owner/repo", "sonarcloud")
+        
+        assert [issue.number for issue in issues] == [1, 2, 3]
+        assert len(responses.calls) == 3
+    
+    @responses.activate
+    def test_get_issues_with_label_custom_page_size(self):
+        """Test the configured page size is sent as per_page."""
+        url = "https://api.github.com/repos/owner/repo/issues"
+        for page in range(1, 3):
+            responses.add(
+                responses.GET,
+                url,
+                json=[{"number": number, "title": f"Issue {number}", "body": "", "state": "open", "labels": []}
+                      for number in (2 * page - 1, 2 * page)],
+                headers={"Link": f'<{url}?page=2>; rel="next", <{url}?page=2>; rel="last"'} if page == 1 else {},
+                match=[matchers.query_param_matcher({
+                    "labels": "sonarcloud", "state": "all", "per_page": "2", "page": str(page)
+                })],
+                status=200
+            )
+        
+        client = GitHubClient("test-token", page_size=2)
+        issues = client.get_issues_with_label("owner/repo", "sonarcloud")
+        
+        assert [issue.number for issue in issues] == [1, 2, 3, 4]
+    
+    @responses.activate
+    def test_iter_issues_with_label_is_lazy(self, github_issues_page1):
+        """Test later pages are only requested once earlier ones are consumed."""
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            body=github_issues_page1,
+            content_type="application/json",
+            headers={"Link": '<https://api.github.com/repos/owner/repo/issues?page=2>; rel="next"'},
+            status=200
+        )
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            json=[],
+            status=200
+        )
+        
+        issues = self.client.iter_issues_with_label("owner/repo", "sonarcloud")
+        
+        assert next(issues).number == 1
+        assert len(responses.calls) == 1
+        assert len(list(issues)) == 99
+        assert len(responses.calls) == 2
+    
+    @responses.activate
+    def test_get_issues_with_label_etag_cache(self, tmp_path):
+        """Test pages are revalidated with ETags and reused on 304 across clients."""
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            json=[{"number": 1, "title": "Issue 1", "body": "", "state": "open", "labels": []}],
+            headers={"ETag": '"abc"'},
+            status=200
+        )
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            status=304
+        )
+        
+        with GitHubClient("test-token", cache_dir=str(tmp_path)) as client:
+            first = client.get_issues_with_label("owner/repo", "sonarcloud")
+        with GitHubClient("test-token", cache_dir=str(tmp_path)) as client:
+            second = client.get_issues_with_label("owner/repo", "sonarcloud")
+        
+        assert [issue.number for issue in first] == [1]
+        assert second == first
+        assert "If-None-Match" not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers["If-None-Match"] == '"abc"'
+    
+    @pytest.mark.parametrize("method,http_method,url,status,args,match", [
+        ("get_issues_with_label", responses.GET, "https://api.github.com/repos/owner/repo/issues", 404,
+         ("owner/repo", "sonarcloud"), "Failed to fetch GitHub issues"),
+        ("create_issue", responses.POST, "https://api.github.com/repos/owner/repo/issues", 422,
+         ("owner/repo", "Title", "Body"), "Failed to create GitHub issue"),
+        ("close_issue", responses.PATCH, "https://api.github.com/repos/owner/repo/issues/123", 404,
+         ("owner/repo", 123), "Failed to close GitHub issue"),
+    ])
+    @responses.activate
+    def test_api_error(self, method, http_method, url, status, args, match):
+        """Test HTTP errors surface as GitHubError."""
+        responses.add(http_method, url, status=status)
+        
+        with pytest.raises(GitHubError, match=match):
+            getattr(self.client, method)(*args)
     
     @responses.activate
     def test_create_issue_success(self):
@@ -113,28 +234,15 @@ class TestGitHubClient:
         
         assert issue.number == 123
         assert issue.title == "New Issue"
-        assert issue.labels == ["sonarcloud", "bug"]
+        assert issue.labels == ("sonarcloud", "bug")
         
         # Check request data
         assert len(responses.calls) == 1
-        import json
         request_data = json.loads(responses.calls[0].request.body)
         assert request_data["title"] == "New Issue"
         assert request_data["body"] == "Issue body"
         assert request_data["labels"] == ["sonarcloud", "bug"]
     
-    @responses.activate
-    def test_create_issue_error(self):
-        """Test error handling in issue creation."""
-        responses.add(
-            responses.POST,
-            "https://api.github.com/repos/owner/repo/issues",
-            status=422
-        )
-        
-        with pytest.raises(Exception, match="Failed to create GitHub issue"):
-            self.client.create_issue("owner/repo", "Title", "Body")
-    
     @responses.activate
     def test_close_issue_success(self):
         """Test successful issue closure."""
@@ -148,22 +256,9 @@ class TestGitHubClient:
         
         assert result is True
         # Check request data
-        import json
         request_data = json.loads(responses.calls[0].request.body)
         assert request_data["state"] == "closed"
     
-    @responses.activate
-    def test_close_issue_error(self):
-        """Test error handling in issue closure."""
-        responses.add(
-            responses.PATCH,
-            "https://api.github.com/repos/owner/repo/issues/123",
-            status=404
-        )
-        
-        with pytest.raises(Exception, match="Failed to close GitHub issue"):
-            self.client.close_issue("owner/repo", 123)
-    
     @responses.activate
     def test_get_issue_events_success(self):
         """Test successful issue events retrieval."""
@@ -236,24 +331,156 @@ class TestGitHubClient:
         
         assert issue is None
     
+    @responses.activate
+    def test_issue_exists_with_sonar_link_uses_index(self):
+        """Test lookups reuse one fetch and see issues created afterwards."""
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            json=[
+                {
+                    "number": 1,
+                    "title": "Issue 1",
+                    "body": "Contains https://sonarcloud.io/project/issues?id=test&issues=key1&open=key1",
+                    "state": "open",
+                    "labels": [{"name": "sonarcloud"}]
+                }
+            ],
+            status=200
+        )
+        responses.add(
+            responses.POST,
+            "https://api.github.com/repos/owner/repo/issues",
+            json={
+                "number": 2,
+                "title": "Issue 2",
+                "body": "https://sonarcloud.io/project/issues?id=test&issues=key2&open=key2",
+                "state": "open",
+                "labels": [{"name": "sonarcloud"}]
+            },
+            status=201
+        )
+        
+        url1 = "https://sonarcloud.io/project/issues?id=test&issues=key1&open=key1"
+        url2 = "https://sonarcloud.io/project/issues?id=test&issues=key2&open=key2"
+        assert self.client.issue_exists_with_sonar_link("owner/repo", url1).number == 1
+        assert self.client.issue_exists_with_sonar_link("owner/repo", url2) is None
+        
+        self.client.create_issue("owner/repo", "Issue 2", url2, ["sonarcloud"])
+        
+        assert self.client.issue_exists_with_sonar_link("owner/repo", url2).number == 2
+        get_calls = [call for call in responses.calls if call.request.method == "GET"]
+        assert len(get_calls) == 1
+    
+    @responses.activate
+    def test_sonar_key_index(self):
+        """Test indexing issues by the SonarCloud issue marker, or link, in their bodies."""
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            json=[
+                {
+                    "number": 1,
+                    "title": "Issue 1",
+                    "body": "**SonarCloud Issue:** AX-key_1:main\n**Type:** BUG",
+                    "state": "open",
+                    "labels": [{"name": "sonarcloud"}]
+                },
+                {
+                    "number": 2,
+                    "title": "Issue 2",
+                    "body": "No SonarCloud reference",
+                    "state": "open",
+                    "labels": [{"name": "sonarcloud"}]
+                },
+                {
+                    "number": 3,
+                    "title": "Issue 3",
+                    "body": "[SonarCloud](https://sonarcloud.io/project/issues?id=p&issues=AYx1)",
+                    "state": "open",
+                    "labels": [{"name": "sonarcloud"}]
+                },
+                {
+                    "number": 4,
+                    "title": "Issue 4",
+                    "body": "See https://github.com/owner/repo/issues?issues=other",
+                    "state": "open",
+                    "labels": [{"name": "sonarcloud"}]
+                }
+            ],
+            status=200
+        )
+        
+        index = self.client.sonar_key_index("owner/repo")
+        
+        assert list(index) == ["AX-key_1:main", "AYx1"]
+        assert index["AX-key_1:main"].number == 1
+        assert index["AYx1"].number == 3
+    
+    def test_session_configuration(self):
+        """Test the session pools connections and retries transient errors."""
+        with GitHubClient("test-token") as client:
+            adapter = client.session.get_adapter("https://api.github.com")
+            assert adapter.max_retries.total == 5
+            assert 429 in adapter.max_retries.status_forcelist
+            assert client.session.headers["Connection"] == "keep-alive"
+            assert adapter.max_retries.respect_retry_after_header
+    
+    @responses.activate
+    def test_rate_limited_request_is_retried(self):
+        """Test a 429 with Retry-After is retried instead of failing the call."""
+        responses.add(
+            responses.HEAD,
+            "https://api.github.com/repos/owner/repo",
+            headers={"Retry-After": "0"},
+            status=429
+        )
+        responses.add(
+            responses.HEAD,
+            "https://api.github.com/repos/owner/repo",
+            status=200
+        )
+        
+        assert self.client.test_connection("owner/repo") is True
+        assert len(responses.calls) == 2
+    
     @responses.activate
     def test_test_connection_success(self):
         """Test successful connection validation."""
         responses.add(
-            responses.GET,
+            responses.HEAD,
             "https://api.github.com/repos/owner/repo",
-            json={"name": "repo"},
+            headers={"X-RateLimit-Remaining": "4999"},
             status=200
         )
         
-        result = self.client.test_connection("owner/repo")
+        with patch.object(self.client.logger, "warning") as warning:
+            result = self.client.test_connection("owner/repo")
+        assert result is True
+        assert responses.calls[0].request.method == "HEAD"
+        warning.assert_not_called()
+    
+    @responses.activate
+    def test_test_connection_warns_on_low_rate_limit(self):
+        """Test a nearly exhausted rate limit is reported."""
+        responses.add(
+            responses.HEAD,
+            "https://api.github.com/repos/owner/repo",
+            headers={"X-RateLimit-Remaining": "42"},
+            status=200
+        )
+        
+        with patch.object(self.client.logger, "warning") as warning:
+            result = self.client.test_connection("owner/repo")
         assert result is True
+        warning.assert_called_once()
+        assert "42" in warning.call_args[0][0]
     
     @responses.activate
     def test_test_connection_error(self):
         """Test connection error."""
         responses.add(
-            responses.GET,
+            responses.HEAD,
             "https://api.github.com/repos/owner/repo",
             status=404
         )
@@ -279,7 +506,7 @@ class TestGitHubIssue:
         assert issue.number == 123
         assert issue.title == "Test Issue"
         assert issue.state == "open"
-        assert issue.labels == ["bug", "enhancement"]
+        assert issue.labels == ("bug", "enhancement")
         assert issue.state_reason == "completed"
     
     def test_github_issue_creation_with_defaults(self):
@@ -291,5 +518,31 @@ class TestGitHubIssue:
             state="open"
         )
         
-        assert issue.labels == []
-        assert issue.state_reason is None
\ No newline at end of file
+        assert issue.labels == ()
+        assert issue.state_reason is None
+    
+    def test_github_issue_from_api_payload(self):
+        """Test validating a raw API payload with label objects and null body."""
+        issue = GitHubIssue.model_validate({
+            "number": 123,
+            "title": "Test Issue",
+            "body": None,
+            "state": "open",
+            "labels": [{"name": "sonarcloud"}, {"name": "bug"}],
+            "user": {"login": "octocat"}
+        })
+        
+        assert issue.body == ""
+        assert issue.labels == ("sonarcloud", "bug")
+    
+    def test_github_issue_null_labels(self):
+        """Test a null labels field from the API becomes an empty tuple."""
+        issue = GitHubIssue.model_validate({
+            "number": 1,
+            "title": "Test Issue",
+            "body": "",
+            "state": "open",
+            "labels": None
+        })
+        
+        assert issue.labels == ()
\ No newline at end of file
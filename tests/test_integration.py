@@ -1,9 +1,8 @@
 """Integration tests for the sync tool."""
 
 import pytest
-from unittest.mock import patch, Mock
-from sonarcloud_github_sync.config import Config
-from sonarcloud_github_sync.sync import SyncEngine
+import responses
+from responses import matchers
 from sonarcloud_github_sync.sonar_client import SonarIssue
 from sonarcloud_github_sync.github_client import GitHubIssue
 
@@ -11,29 +10,9 @@ from sonarcloud_github_sync.github_client import GitHubIssue
 class TestIntegration:
     """Integration tests for sync functionality."""
     
-    def setup_method(self):
-        """Set up test configuration."""
-        self.config = Config(
-            sonar_token="test-sonar-token",
-            github_token="test-github-token",
-            sonar_project_key="test-project",
-            github_repo="owner/repo",
-            issue_types=["BUG", "VULNERABILITY"]
-        )
-    
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_full_workflow_new_issues(self, mock_github_client, mock_sonar_client):
+    def test_full_workflow_new_issues(self, make_engine, mocked_clients):
         """Test complete workflow with new issues."""
-        # Setup mocks
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock credential validation
-        mock_sonar_instance.test_connection.return_value = True
-        mock_github_instance.test_connection.return_value = True
+        mock_sonar_instance, mock_github_instance = mocked_clients
         
         # Mock SonarCloud issues
         sonar_issues = [
@@ -61,7 +40,6 @@ class TestIntegration:
         mock_sonar_instance.get_issues.return_value = sonar_issues
         
         # Mock GitHub - no existing issues
-        mock_github_instance.issue_exists_with_sonar_link.return_value = None
         mock_github_instance.get_issues_with_label.return_value = []
         
         # Mock GitHub issue creation
@@ -72,7 +50,7 @@ class TestIntegration:
         mock_github_instance.create_issue.side_effect = created_issues
         
         # Run sync
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         results = sync_engine.full_sync()
         
         # Verify results
@@ -86,6 +64,7 @@ class TestIntegration:
         assert mock_github_instance.create_issue.call_count == 2
         
         # Verify issue creation details
+        # Issues are created one at a time, in SonarCloud order
         create_calls = mock_github_instance.create_issue.call_args_list
         
         # First issue
@@ -101,19 +80,9 @@ class TestIntegration:
         assert "**SonarCloud Issue:** sonar-2" in args2[2]
         assert args2[3] == ["sonarcloud", "security"]
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_full_workflow_with_duplicates_and_closures(self, mock_github_client, mock_sonar_client):
+    def test_full_workflow_with_duplicates_and_closures(self, make_engine, mocked_clients):
         """Test workflow with duplicate prevention and issue closures."""
-        # Setup mocks
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock credential validation
-        mock_sonar_instance.test_connection.return_value = True
-        mock_github_instance.test_connection.return_value = True
+        mock_sonar_instance, mock_github_instance = mocked_clients
         
         # Mock SonarCloud - only one open issue now
         sonar_issues = [
@@ -155,18 +124,13 @@ class TestIntegration:
             )
         ]
         
-        def mock_issue_exists(repo, sonar_url):
-            if "sonar-1" in sonar_url:
-                return existing_github_issues[0]  # Duplicate found
-            return None
-        
-        mock_github_instance.issue_exists_with_sonar_link.side_effect = mock_issue_exists
+        # Only sonar-1 is still open in SonarCloud, so it is the duplicate
         mock_github_instance.get_issues_with_label.return_value = existing_github_issues
         mock_github_instance.close_issue.return_value = True
-        mock_sonar_instance.resolve_issue_as_wont_fix.return_value = True
+        mock_sonar_instance.resolve_issues_as_wont_fix.return_value = 1
         
         # Run sync
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         results = sync_engine.full_sync()
         
         # Verify results
@@ -175,25 +139,19 @@ class TestIntegration:
         assert results["closed"] == 1  # One GitHub issue closed (sonar-2 resolved)
         assert results["marked_wont_fix"] == 1  # One SonarCloud issue marked won't fix
         
+        # Both phases share one listing and look duplicates up by key
+        mock_github_instance.get_issues_with_label.assert_called_once_with("owner/repo", "sonarcloud")
+        mock_github_instance.issue_exists_with_sonar_link.assert_not_called()
+        
         # Verify GitHub issue closure
         mock_github_instance.close_issue.assert_called_once_with("owner/repo", 2)
         
         # Verify SonarCloud won't fix marking
-        mock_sonar_instance.resolve_issue_as_wont_fix.assert_called_once_with("sonar-3")
+        mock_sonar_instance.resolve_issues_as_wont_fix.assert_called_once_with(["sonar-3"])
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_error_handling_during_sync(self, mock_github_client, mock_sonar_client):
+    def test_error_handling_during_sync(self, make_engine, mocked_clients):
         """Test error handling during synchronization."""
-        # Setup mocks
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock credential validation
-        mock_sonar_instance.test_connection.return_value = True
-        mock_github_instance.test_connection.return_value = True
+        mock_sonar_instance, mock_github_instance = mocked_clients
         
         # Mock SonarCloud issues
         sonar_issues = [
@@ -210,14 +168,13 @@ class TestIntegration:
         mock_sonar_instance.get_issues.return_value = sonar_issues
         
         # Mock GitHub - no existing issues
-        mock_github_instance.issue_exists_with_sonar_link.return_value = None
         mock_github_instance.get_issues_with_label.return_value = []
         
         # Mock GitHub issue creation failure
         mock_github_instance.create_issue.side_effect = Exception("GitHub API error")
         
         # Run sync - should not raise exception but handle error gracefully
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         results = sync_engine.full_sync()
         
         # Should complete with 0 created issues due to error
@@ -226,19 +183,9 @@ class TestIntegration:
         assert results["closed"] == 0
         assert results["marked_wont_fix"] == 0
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_dry_run_integration(self, mock_github_client, mock_sonar_client):
+    def test_dry_run_integration(self, make_engine, mocked_clients):
         """Test dry run mode integration."""
-        # Setup mocks
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock credential validation
-        mock_sonar_instance.test_connection.return_value = True
-        mock_github_instance.test_connection.return_value = True
+        mock_sonar_instance, mock_github_instance = mocked_clients
         
         # Mock SonarCloud issues
         sonar_issues = [
@@ -265,11 +212,10 @@ class TestIntegration:
                 state_reason="not_planned"
             )
         ]
-        mock_github_instance.issue_exists_with_sonar_link.return_value = None
         mock_github_instance.get_issues_with_label.return_value = github_issues
         
         # Run dry run sync
-        sync_engine = SyncEngine(self.config, dry_run=True)
+        sync_engine = make_engine(dry_run=True)
         results = sync_engine.full_sync()
         
         # Verify results show what would happen
@@ -279,11 +225,11 @@ class TestIntegration:
         # Verify no actual API calls were made for modifications
         mock_github_instance.create_issue.assert_not_called()
         mock_github_instance.close_issue.assert_not_called()
-        mock_sonar_instance.resolve_issue_as_wont_fix.assert_not_called()
+        mock_sonar_instance.resolve_issues_as_wont_fix.assert_not_called()
     
-    def test_issue_body_format_and_parsing(self):
+    def test_issue_body_format_and_parsing(self, make_engine):
         """Test issue body formatting and key extraction."""
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         
         # Create test SonarIssue
         sonar_issue = SonarIssue(
@@ -317,4 +263,60 @@ class TestIntegration:
         # Test with edge cases
         edge_body = "**SonarCloud Issue:** key-with-underscores_and:colons-123"
         extracted_edge_key = sync_engine._extract_sonar_issue_key(edge_body)
-        assert extracted_edge_key == "key-with-underscores_and:colons-123"
\ No newline at end of file
+        assert extracted_edge_key == "key-with-underscores_and:colons-123"
+    
+    @responses.activate
+    def test_full_sync_over_http(self, make_engine):
+        """Test a full sync against mocked HTTP endpoints using the real clients."""
+        responses.add(responses.GET, "https://sonarcloud.io/api/authentication/validate", json={"valid": True})
+        responses.add(responses.HEAD, "https://api.github.com/repos/owner/repo")
+        responses.add(
+            responses.GET,
+            "https://sonarcloud.io/api/issues/search",
+            json={
+                "paging": {"pageIndex": 1, "pageSize": 500, "total": 3},
+                "issues": [
+                    {
+                        "key": f"sonar-{number}",
+                        "type": "BUG",
+                        "severity": "MAJOR",
+                        "status": "OPEN",
+                        "message": f"Bug {number}",
+                        "component": "test-component",
+                        "project": "test-project"
+                    }
+                    for number in range(1, 4)
+                ]
+            }
+        )
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/owner/repo/issues",
+            json=[
+                {"number": 10, "title": "Resolved bug", "body": "**SonarCloud Issue:** sonar-9",
+                 "state": "open", "labels": [{"name": "sonarcloud"}]},
+                {"number": 11, "title": "Won't fix", "body": "**SonarCloud Issue:** sonar-8",
+                 "state": "closed", "state_reason": "not_planned", "labels": [{"name": "sonarcloud"}]}
+            ]
+        )
+        for number in range(1, 4):
+            responses.add(
+                responses.POST,
+                "https://api.github.com/repos/owner/repo/issues",
+                json={"number": 100 + number, "title": f"Bug {number}", "body": "", "state": "open", "labels": []},
+                status=201
+            )
+        responses.add(responses.PATCH, "https://api.github.com/repos/owner/repo/issues/10", json={})
+        responses.add(
+            responses.POST,
+            "https://sonarcloud.io/api/issues/bulk_change",
+            json={"total": 1, "success": 1, "ignored": 0, "failures": 0},
+            match=[matchers.urlencoded_params_matcher({"issues": "sonar-8", "do_transition": "wontfix"})]
+        )
+        
+        results = make_engine().full_sync()
+        
+        assert results == {"created": 3, "skipped": 0, "closed": 1, "marked_wont_fix": 1}
+        methods = [call.request.method for call in responses.calls]
+        assert methods.count("POST") == 4
+        assert methods.count("PATCH") == 1
\ No newline at end of file
@@ -1,8 +1,12 @@
 """Tests for SonarCloud API client."""
 
+import sys
 import pytest
 import responses
-from sonarcloud_github_sync.sonar_client import SonarClient, SonarIssue
+from responses import matchers
+from unittest.mock import patch
+from pydantic import ValidationError
+from sonarcloud_github_sync.sonar_client import SonarClient, SonarCloudError, SonarIssue
 
 
 class TestSonarClient:
@@ -53,10 +57,72 @@ class TestSonarClient:
         assert issues[0].type == "BUG"
         assert issues[0].severity == "MAJOR"
         assert issues[0].message == "Test issue message"
-        assert issues[0].tags == ["test-tag"]
+        assert issues[0].tags == ("test-tag",)
+        assert issues[0].tags[0] is sys.intern("test-tag")
         assert issues[1].key == "test-issue-2"
         assert issues[1].type == "VULNERABILITY"
-        assert issues[1].tags == []
+        assert issues[1].tags == ()
+    
+    @responses.activate
+    def test_get_issues_pagination(self):
+        """Test all pages reported by the paging block are fetched."""
+        for page in range(1, 4):
+            responses.add(
+                responses.GET,
+                "https://sonarcloud.io/api/issues/search",
+                json={
+                    "paging": {"pageIndex": page, "pageSize": 1, "total": 3},
+                    "issues": [
+                        {
+                            "key": f"issue-{page}",
+                            "type": "BUG",
+                            "severity": "MAJOR",
+                            "status": "OPEN",
+                            "message": f"Issue {page}",
+                            "component": "test-component",
+                            "project": "test-project"
+                        }
+                    ]
+                },
+                match=[matchers.query_param_matcher({
+                    "componentKeys": "test-project", "statuses": "OPEN", "ps": "500", "p": str(page)
+                })],
+                status=200
+            )
+        
+        issues = self.client.get_issues("test-project")
+        
+        assert [issue.key for issue in issues] == ["issue-1", "issue-2", "issue-3"]
+        assert len(responses.calls) == 3
+    
+    @responses.activate
+    def test_iter_issues_is_lazy(self):
+        """Test no request is made until the generator is consumed."""
+        responses.add(
+            responses.GET,
+            "https://sonarcloud.io/api/issues/search",
+            json={
+                "paging": {"pageIndex": 1, "pageSize": 500, "total": 1},
+                "issues": [
+                    {
+                        "key": "issue-1",
+                        "type": "BUG",
+                        "severity": "MAJOR",
+                        "status": "OPEN",
+                        "message": "Issue 1",
+                        "component": "test-component",
+                        "project": "test-project"
+                    }
+                ]
+            },
+            status=200
+        )
+        
+        issues = self.client.iter_issues("test-project")
+        
+        assert len(responses.calls) == 0
+        assert [issue.key for issue in issues] == ["issue-1"]
+        assert len(responses.calls) == 1
     
     @responses.activate
     def test_get_issues_with_filter(self):
@@ -75,17 +141,19 @@ class TestSonarClient:
         request = responses.calls[0].request
         assert "types=BUG%2CVULNERABILITY" in request.url
     
+    @pytest.mark.parametrize("method,http_method,url,status,args,match", [
+        ("get_issues", responses.GET, "https://sonarcloud.io/api/issues/search", 401,
+         ("test-project",), "Failed to fetch SonarCloud issues"),
+        ("resolve_issue_as_wont_fix", responses.POST, "https://sonarcloud.io/api/issues/do_transition", 404,
+         ("test-issue-key",), "Failed to resolve SonarCloud issue"),
+    ])
     @responses.activate
-    def test_get_issues_api_error(self):
-        """Test handling of API errors."""
-        responses.add(
-            responses.GET,
-            "https://sonarcloud.io/api/issues/search",
-            status=401
-        )
+    def test_api_error(self, method, http_method, url, status, args, match):
+        """Test HTTP errors surface as SonarCloudError."""
+        responses.add(http_method, url, status=status)
         
-        with pytest.raises(Exception, match="Failed to fetch SonarCloud issues"):
-            self.client.get_issues("test-project")
+        with pytest.raises(SonarCloudError, match=match):
+            getattr(self.client, method)(*args)
     
     @responses.activate
     def test_resolve_issue_as_wont_fix_success(self):
@@ -106,16 +174,51 @@ class TestSonarClient:
         assert "transition=wontfix" in request.body
     
     @responses.activate
-    def test_resolve_issue_as_wont_fix_error(self):
-        """Test error handling in issue resolution."""
+    def test_resolve_issues_as_wont_fix_single_request(self):
+        """Test several issues are resolved with one bulk_change request."""
         responses.add(
             responses.POST,
-            "https://sonarcloud.io/api/issues/do_transition",
-            status=404
+            "https://sonarcloud.io/api/issues/bulk_change",
+            json={"total": 3, "success": 3, "ignored": 0, "failures": 0},
+            status=200
         )
         
-        with pytest.raises(Exception, match="Failed to resolve SonarCloud issue"):
-            self.client.resolve_issue_as_wont_fix("test-issue-key")
+        result = self.client.resolve_issues_as_wont_fix(["key-1", "key-2", "key-3"])
+        
+        assert result == 3
+        assert len(responses.calls) == 1
+        request = responses.calls[0].request
+        assert "issues=key-1%2Ckey-2%2Ckey-3" in request.body
+        assert "do_transition=wontfix" in request.body
+    
+    @responses.activate
+    def test_resolve_issues_as_wont_fix_logs_partial_success(self):
+        """Test a bulk_change that skips issues is logged with its failure and ignored counts."""
+        responses.add(
+            responses.POST,
+            "https://sonarcloud.io/api/issues/bulk_change",
+            json={"total": 3, "success": 1, "ignored": 1, "failures": 1},
+            status=200
+        )
+        
+        with patch.object(self.client.logger, "warning") as warning:
+            result = self.client.resolve_issues_as_wont_fix(["key-1", "key-2", "key-3"])
+        
+        assert result == 1
+        message = warning.call_args.args[0]
+        assert "1 of 3" in message
+        assert "1 failed, 1 ignored" in message
+        assert "key-1, key-2, key-3" in message
+    
+    def test_session_configuration(self):
+        """Test the session pools connections and retries transient errors."""
+        with SonarClient("test-token") as client:
+            adapter = client.session.get_adapter("https://sonarcloud.io")
+            assert adapter.max_retries.total == 5
+            assert 429 in adapter.max_retries.status_forcelist
+            assert "POST" not in adapter.max_retries.allowed_methods
+            assert client.session.headers["Connection"] == "keep-alive"
+            assert adapter.max_retries.respect_retry_after_header
     
     @responses.activate
     def test_test_connection_success(self):
@@ -174,7 +277,24 @@ class TestSonarIssue:
         
         assert issue.key == "test-key"
         assert issue.type == "BUG"
-        assert issue.tags == ["tag1", "tag2"]
+        assert issue.tags == ("tag1", "tag2")
+    
+    def test_sonar_issue_is_frozen(self):
+        """Test SonarIssue instances are immutable and hashable."""
+        issue = SonarIssue(
+            key="test-key",
+            type="BUG",
+            severity="MAJOR",
+            status="OPEN",
+            message="Test message",
+            component="test-component",
+            project="test-project"
+        )
+        
+        with pytest.raises(ValidationError):
+            issue.status = "CLOSED"
+        assert issue.tags == ()
+        assert {issue: True}[issue]
     
     def test_sonar_issue_url_generation(self):
         """Test URL generation for SonarIssue."""
@@ -189,4 +309,6 @@ class TestSonarIssue:
         )
         
         expected_url = "https://sonarcloud.io/project/issues?id=test-project&issues=test-key&open=test-key"
-        assert issue.url == expected_url
\ No newline at end of file
+        assert issue.url == expected_url
+        # URL is built once and cached on the instance
+        assert issue.url is issue.url
\ No newline at end of file
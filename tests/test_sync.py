@@ -1,280 +1,338 @@
 """Tests for synchronization engine."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from sonarcloud_github_sync.sync import SyncEngine
-from sonarcloud_github_sync.config import Config
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from sonarcloud_github_sync import github_client
+from sonarcloud_github_sync.sync import CredentialError, SyncEngine
 from sonarcloud_github_sync.sonar_client import SonarIssue
 from sonarcloud_github_sync.github_client import GitHubIssue
 
+# Immutable sync inputs shared across tests
+SONAR_BUG_ISSUE = SonarIssue(
+    key="issue-1",
+    type="BUG",
+    severity="MAJOR",
+    status="OPEN",
+    message="Test bug",
+    component="test-component",
+    project="test-project",
+    tags=["security"]
+)
+SONAR_VULN_ISSUE = SonarIssue(
+    key="issue-2",
+    type="VULNERABILITY",
+    severity="CRITICAL",
+    status="OPEN",
+    message="Security issue",
+    component="test-component",
+    project="test-project",
+    tags=[]
+)
+GH_NOT_PLANNED = GitHubIssue(
+    number=1,
+    title="Test Issue",
+    body="**SonarCloud Issue:** issue-1\nSome content",
+    state="closed",
+    labels=["sonarcloud"],
+    state_reason="not_planned"
+)
+GH_COMPLETED = GitHubIssue(
+    number=2,
+    title="Another Issue",
+    body="**SonarCloud Issue:** issue-2\nSome content",
+    state="closed",
+    labels=["sonarcloud"],
+    state_reason="completed"  # Should not trigger won't fix
+)
+# Bodies without the "**SonarCloud Issue:**" marker whose loosely matched keys must not drive closes or Won't Fix
+UNMARKED_BODIES = (
+    "[SonarCloud](https://sonarcloud.io/project/issues?id=p&issues=AYx1)",
+    "<https://sonarcloud.io/project/issues?id=p&issues=AYx1>",
+    "SonarCloud Issue: (pending triage)",
+    "See https://github.com/owner/repo/issues?issues=other",
+)
+# GitHub issues returned by create_issue, in creation order
+CREATED_ISSUES = (
+    GitHubIssue(number=1, title="Test bug", body="", state="open"),
+    GitHubIssue(number=2, title="Security issue", body="", state="open")
+)
+
+
+def _stub_clients(monkeypatch, sonar_ok, github_ok):
+    """Make SyncEngine use plain stand-in clients whose connection checks return the given results."""
+    sonar = SimpleNamespace(test_connection=lambda: sonar_ok)
+    github = SimpleNamespace(test_connection=lambda repo: github_ok)
+    monkeypatch.setattr("sonarcloud_github_sync.sync.SonarClient", lambda *args, **kwargs: sonar)
+    monkeypatch.setattr("sonarcloud_github_sync.sync.GitHubClient", lambda *args, **kwargs: github)
+
 
 class TestSyncEngine:
     """Test synchronization engine."""
     
-    def setup_method(self):
-        """Set up test sync engine."""
-        self.config = Config(
-            sonar_token="test-sonar-token",
-            github_token="test-github-token",
-            sonar_project_key="test-project",
-            github_repo="owner/repo",
-            issue_types=["BUG", "VULNERABILITY"]
-        )
-        self.sync_engine = SyncEngine(self.config)
-    
-    def test_init_with_dry_run(self):
-        """Test initialization with dry run mode."""
-        sync_engine = SyncEngine(self.config, dry_run=True)
-        assert sync_engine.dry_run is True
+    @pytest.mark.parametrize("kwargs,expected", [
+        pytest.param({"dry_run": True}, True, id="with-dry-run"),
+        pytest.param({}, False, id="without-dry-run"),
+    ])
+    def test_init_dry_run(self, config, kwargs, expected):
+        """Test initialization with and without dry run mode."""
+        sync_engine = SyncEngine(config, **kwargs)
+        assert sync_engine.dry_run is expected
     
-    def test_init_without_dry_run(self):
-        """Test initialization without dry run mode."""
-        sync_engine = SyncEngine(self.config)
-        assert sync_engine.dry_run is False
-    
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_validate_credentials_success(self, mock_github_client, mock_sonar_client):
+    def test_validate_credentials_success(self, make_engine, mocked_clients):
         """Test successful credential validation."""
-        # Mock client instances
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
+        mock_sonar_instance, mock_github_instance = mocked_clients
         
         # Mock successful connections
         mock_sonar_instance.test_connection.return_value = True
         mock_github_instance.test_connection.return_value = True
         
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         result = sync_engine.validate_credentials()
         
         assert result is True
         mock_sonar_instance.test_connection.assert_called_once()
         mock_github_instance.test_connection.assert_called_once_with("owner/repo")
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_validate_credentials_sonar_failure(self, mock_github_client, mock_sonar_client):
-        """Test credential validation with SonarCloud failure."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
+    def test_context_manager_closes_clients(self, make_engine, mocked_clients):
+        """Test leaving the engine's context closes both clients, even after an error."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        
+        with pytest.raises(RuntimeError):
+            with make_engine():
+                raise RuntimeError("sync failed")
+        
+        mock_sonar_instance.close.assert_called_once()
+        mock_github_instance.close.assert_called_once()
+    
+    def test_close_releases_page_cache(self, config, tmp_path):
+        """Test closing the engine closes the GitHub client's on-disk page cache."""
+        with SyncEngine(config.model_copy(update={"cache_dir": str(tmp_path)})) as sync_engine:
+            assert sync_engine.github_client._page_cache is not None
         
-        mock_sonar_instance.test_connection.return_value = False
+        assert sync_engine.github_client._page_cache is None
+    
+    def test_validate_credentials_sonar_failure(self, make_engine, monkeypatch):
+        """Test credential validation with SonarCloud failure."""
+        _stub_clients(monkeypatch, sonar_ok=False, github_ok=True)
         
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         
-        with pytest.raises(Exception, match="Invalid SonarCloud credentials"):
+        with pytest.raises(CredentialError) as exc_info:
             sync_engine.validate_credentials()
+        assert "Invalid SonarCloud credentials" in str(exc_info.value)
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_validate_credentials_github_failure(self, mock_github_client, mock_sonar_client):
+    def test_validate_credentials_github_failure(self, make_engine, monkeypatch):
         """Test credential validation with GitHub failure."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
+        _stub_clients(monkeypatch, sonar_ok=True, github_ok=False)
         
-        mock_sonar_instance.test_connection.return_value = True
-        mock_github_instance.test_connection.return_value = False
+        sync_engine = make_engine()
         
-        sync_engine = SyncEngine(self.config)
-        
-        with pytest.raises(Exception, match="Invalid GitHub credentials"):
+        with pytest.raises(CredentialError) as exc_info:
             sync_engine.validate_credentials()
+        assert "Invalid GitHub credentials" in str(exc_info.value)
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_sync_sonar_to_github_create_new_issues(self, mock_github_client, mock_sonar_client):
-        """Test creating new GitHub issues from SonarCloud."""
-        # Mock client instances
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock SonarCloud issues
-        sonar_issues = [
-            SonarIssue(
-                key="issue-1",
-                type="BUG",
-                severity="MAJOR",
-                status="OPEN",
-                message="Test bug",
-                component="test-component",
-                project="test-project",
-                tags=["security"]
-            ),
-            SonarIssue(
-                key="issue-2",
-                type="VULNERABILITY",
-                severity="CRITICAL",
-                status="OPEN",
-                message="Security issue",
-                component="test-component",
-                project="test-project",
-                tags=[]
-            )
-        ]
+    @pytest.mark.parametrize("sonar_issues,existing,created_issues,dry_run,expected,create_calls", [
+        pytest.param(
+            [SONAR_BUG_ISSUE, SONAR_VULN_ISSUE], [], CREATED_ISSUES,
+            False, {"created": 2, "skipped": 0, "closed": 0}, 2,
+            id="create-new-issues"
+        ),
+        pytest.param(
+            [SONAR_BUG_ISSUE],
+            [GitHubIssue(number=1, title="Test bug", body="**SonarCloud Issue:** issue-1", state="open")],
+            (), False, {"created": 0, "skipped": 1, "closed": 0}, 0,
+            id="skip-existing"
+        ),
+        # Issues that only carry the SonarCloud link are still recognised as duplicates
+        pytest.param(
+            [SONAR_BUG_ISSUE],
+            [GitHubIssue(number=1, title="Test bug", body=SONAR_BUG_ISSUE.url, state="open")],
+            (), False, {"created": 0, "skipped": 1, "closed": 0}, 0,
+            id="skip-existing-by-link"
+        ),
+        # Should not actually create issues in dry run
+        pytest.param(
+            [SONAR_BUG_ISSUE], [], (), True, {"created": 1, "skipped": 0, "closed": 0}, 0,
+            id="dry-run"
+        ),
+    ])
+    def test_sync_sonar_to_github(
+        self, make_engine, mocked_clients, sonar_issues, existing, created_issues, dry_run, expected, create_calls
+    ):
+        """Test SonarCloud to GitHub sync creates, skips and counts issues."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
         mock_sonar_instance.get_issues.return_value = sonar_issues
+        mock_github_instance.get_issues_with_label.return_value = existing
+        mock_github_instance.create_issue.side_effect = list(created_issues)
         
-        # Mock GitHub - no existing issues
-        mock_github_instance.issue_exists_with_sonar_link.return_value = None
-        mock_github_instance.get_issues_with_label.return_value = []
+        sync_engine = make_engine(dry_run=dry_run)
+        results = sync_engine.sync_sonar_to_github()
+        
+        assert results == expected
+        assert mock_github_instance.create_issue.call_count == create_calls
+    
+    def test_sync_sonar_to_github_closes_resolved_concurrently(self, make_engine, mocked_clients):
+        """Test every resolved issue is closed and failures don't stop the others."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
         
-        # Mock GitHub issue creation
-        mock_github_instance.create_issue.side_effect = [
-            GitHubIssue(number=1, title="Test bug", body="", state="open"),
-            GitHubIssue(number=2, title="Security issue", body="", state="open")
+        mock_sonar_instance.get_issues.return_value = []
+        mock_github_instance.get_issues_with_label.return_value = [
+            GitHubIssue(
+                number=number,
+                title=f"Issue {number}",
+                body=f"**SonarCloud Issue:** issue-{number}\nSome content",
+                state="open",
+                labels=["sonarcloud"]
+            )
+            for number in range(1, 6)
         ]
         
-        sync_engine = SyncEngine(self.config)
+        def close(repo, number):
+            if number == 2:
+                raise Exception("GitHub API error")
+            return True
+        
+        mock_github_instance.close_issue.side_effect = close
+        
+        sync_engine = make_engine()
         results = sync_engine.sync_sonar_to_github()
         
-        assert results["created"] == 2
-        assert results["skipped"] == 0
-        assert results["closed"] == 0
-        assert mock_github_instance.create_issue.call_count == 2
+        assert results["closed"] == 4
+        assert sorted(call.args[1] for call in mock_github_instance.close_issue.call_args_list) == [1, 2, 3, 4, 5]
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_sync_sonar_to_github_skip_existing(self, mock_github_client, mock_sonar_client):
-        """Test skipping existing GitHub issues."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock SonarCloud issues
-        sonar_issues = [
-            SonarIssue(
-                key="issue-1",
-                type="BUG",
-                severity="MAJOR",
-                status="OPEN",
-                message="Test bug",
-                component="test-component",
-                project="test-project"
-            )
+    def test_sync_sonar_to_github_parses_each_body_once(self, make_engine, mocked_clients):
+        """Test the duplicate index and the closure pass share one key extraction per issue."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        mock_sonar_instance.get_issues.return_value = [SONAR_BUG_ISSUE]
+        mock_github_instance.get_issues_with_label.return_value = [
+            GitHubIssue(number=1, title="Test bug", body="**SonarCloud Issue:** issue-1", state="open"),
+            GitHubIssue(number=2, title="Old bug", body="**SonarCloud Issue:** issue-9", state="open")
         ]
-        mock_sonar_instance.get_issues.return_value = sonar_issues
         
-        # Mock existing GitHub issue
-        existing_issue = GitHubIssue(number=1, title="Test bug", body="", state="open")
-        mock_github_instance.issue_exists_with_sonar_link.return_value = existing_issue
-        mock_github_instance.get_issues_with_label.return_value = []
+        sync_engine = make_engine()
+        extract = Mock(wraps=github_client.extract_sonar_key)
+        with patch("sonarcloud_github_sync.sync.extract_sonar_key", extract), \
+                patch("sonarcloud_github_sync.github_client.extract_sonar_key", extract):
+            results = sync_engine.sync_sonar_to_github()
         
-        sync_engine = SyncEngine(self.config)
+        assert results == {"created": 0, "skipped": 1, "closed": 1}
+        assert extract.call_count == 2
+    
+    @pytest.mark.parametrize("body", UNMARKED_BODIES)
+    def test_sync_sonar_to_github_keeps_unmarked_issues_open(self, make_engine, mocked_clients, body):
+        """Test open issues without the body marker are not closed as resolved."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        mock_sonar_instance.get_issues.return_value = []
+        mock_github_instance.get_issues_with_label.return_value = [
+            GitHubIssue(number=1, title="Issue 1", body=body, state="open", labels=["sonarcloud"])
+        ]
+        
+        sync_engine = make_engine()
         results = sync_engine.sync_sonar_to_github()
         
-        assert results["created"] == 0
-        assert results["skipped"] == 1
         assert results["closed"] == 0
-        mock_github_instance.create_issue.assert_not_called()
+        mock_github_instance.close_issue.assert_not_called()
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_sync_sonar_to_github_dry_run(self, mock_github_client, mock_sonar_client):
-        """Test dry run mode for SonarCloud to GitHub sync."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock SonarCloud issues
-        sonar_issues = [
-            SonarIssue(
-                key="issue-1",
-                type="BUG",
-                severity="MAJOR",
-                status="OPEN",
-                message="Test bug",
-                component="test-component",
-                project="test-project"
-            )
-        ]
-        mock_sonar_instance.get_issues.return_value = sonar_issues
-        mock_github_instance.issue_exists_with_sonar_link.return_value = None
-        mock_github_instance.get_issues_with_label.return_value = []
+    @pytest.mark.parametrize("github_issues,dry_run,bulk_keys", [
+        pytest.param([GH_NOT_PLANNED, GH_COMPLETED], False, ["issue-1"], id="mark-wont-fix"),
+        # Should not actually mark issues in dry run
+        pytest.param([GH_NOT_PLANNED], True, None, id="dry-run"),
+    ])
+    def test_sync_github_to_sonar(self, make_engine, mocked_clients, github_issues, dry_run, bulk_keys):
+        """Test marking SonarCloud issues as won't fix for not-planned GitHub issues."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        mock_github_instance.get_issues_with_label.return_value = github_issues
+        mock_sonar_instance.resolve_issues_as_wont_fix.return_value = 1
         
-        sync_engine = SyncEngine(self.config, dry_run=True)
-        results = sync_engine.sync_sonar_to_github()
+        sync_engine = make_engine(dry_run=dry_run)
+        results = sync_engine.sync_github_to_sonar()
         
-        assert results["created"] == 1
-        assert results["skipped"] == 0
-        # Should not actually create issues in dry run
-        mock_github_instance.create_issue.assert_not_called()
+        assert results["marked_wont_fix"] == 1
+        if bulk_keys is None:
+            mock_sonar_instance.resolve_issues_as_wont_fix.assert_not_called()
+        else:
+            mock_sonar_instance.resolve_issues_as_wont_fix.assert_called_once_with(bulk_keys)
+        mock_sonar_instance.resolve_issue_as_wont_fix.assert_not_called()
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_sync_github_to_sonar_mark_wont_fix(self, mock_github_client, mock_sonar_client):
-        """Test marking SonarCloud issues as won't fix."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock GitHub issues
-        github_issues = [
+    def test_sync_github_to_sonar_falls_back_only_for_failed_chunk(self, make_engine, mocked_clients, monkeypatch):
+        """Test a failed bulk chunk keeps earlier chunks' progress and only its own issues go one by one."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        monkeypatch.setattr("sonarcloud_github_sync.sync.MAX_BULK_CHANGE_ISSUES", 2)
+        mock_github_instance.get_issues_with_label.return_value = [
             GitHubIssue(
-                number=1,
-                title="Test Issue",
-                body="**SonarCloud Issue:** issue-1\nSome content",
+                number=number,
+                title=f"Issue {number}",
+                body=f"**SonarCloud Issue:** issue-{number}",
                 state="closed",
-                labels=["sonarcloud"],
                 state_reason="not_planned"
-            ),
-            GitHubIssue(
-                number=2,
-                title="Another Issue",
-                body="**SonarCloud Issue:** issue-2\nSome content",
-                state="closed",
-                labels=["sonarcloud"],
-                state_reason="completed"  # Should not trigger won't fix
             )
+            for number in range(1, 6)
         ]
-        mock_github_instance.get_issues_with_label.return_value = github_issues
+        mock_sonar_instance.resolve_issues_as_wont_fix.side_effect = [2, Exception("bulk_change unavailable"), 1]
         mock_sonar_instance.resolve_issue_as_wont_fix.return_value = True
         
-        sync_engine = SyncEngine(self.config)
+        sync_engine = make_engine()
         results = sync_engine.sync_github_to_sonar()
         
-        assert results["marked_wont_fix"] == 1
-        mock_sonar_instance.resolve_issue_as_wont_fix.assert_called_once_with("issue-1")
+        assert results["marked_wont_fix"] == 5
+        assert [call.args[0] for call in mock_sonar_instance.resolve_issues_as_wont_fix.call_args_list] == [
+            ["issue-1", "issue-2"], ["issue-3", "issue-4"], ["issue-5"]
+        ]
+        assert [call.args[0] for call in mock_sonar_instance.resolve_issue_as_wont_fix.call_args_list] == [
+            "issue-3", "issue-4"
+        ]
+    
+    @pytest.mark.parametrize("body", UNMARKED_BODIES)
+    def test_sync_github_to_sonar_ignores_unmarked_issues(self, make_engine, mocked_clients, body):
+        """Test not-planned issues without the body marker are not sent to Won't Fix."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        mock_github_instance.get_issues_with_label.return_value = [
+            GitHubIssue(
+                number=1, title="Issue 1", body=body, state="closed",
+                labels=["sonarcloud"], state_reason="not_planned"
+            )
+        ]
+        
+        sync_engine = make_engine()
+        results = sync_engine.sync_github_to_sonar()
+        
+        assert results["marked_wont_fix"] == 0
+        mock_sonar_instance.resolve_issues_as_wont_fix.assert_not_called()
+        mock_sonar_instance.resolve_issue_as_wont_fix.assert_not_called()
     
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_sync_github_to_sonar_dry_run(self, mock_github_client, mock_sonar_client):
-        """Test dry run mode for GitHub to SonarCloud sync."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock GitHub issues
+    def test_sync_github_to_sonar_falls_back_to_per_issue(self, make_engine, mocked_clients):
+        """Test a failed bulk call resolves issues one by one and failures don't stop the others."""
+        mock_sonar_instance, mock_github_instance = mocked_clients
+        
         github_issues = [
             GitHubIssue(
-                number=1,
-                title="Test Issue",
-                body="**SonarCloud Issue:** issue-1\nSome content",
+                number=number,
+                title=f"Issue {number}",
+                body=f"**SonarCloud Issue:** issue-{number}\nSome content",
                 state="closed",
                 labels=["sonarcloud"],
                 state_reason="not_planned"
             )
+            for number in range(1, 6)
         ]
         mock_github_instance.get_issues_with_label.return_value = github_issues
         
-        sync_engine = SyncEngine(self.config, dry_run=True)
+        def resolve(key):
+            if key == "issue-3":
+                raise Exception("SonarCloud API error")
+            return True
+        
+        mock_sonar_instance.resolve_issues_as_wont_fix.side_effect = Exception("bulk_change unavailable")
+        mock_sonar_instance.resolve_issue_as_wont_fix.side_effect = resolve
+        
+        sync_engine = make_engine()
         results = sync_engine.sync_github_to_sonar()
         
-        assert results["marked_wont_fix"] == 1
-        # Should not actually mark issues in dry run
-        mock_sonar_instance.resolve_issue_as_wont_fix.assert_not_called()
+        assert results["marked_wont_fix"] == 4
+        assert mock_sonar_instance.resolve_issue_as_wont_fix.call_count == 5
     
-    def test_create_github_issue_body(self):
+    def test_create_github_issue_body(self, engine):
         """Test GitHub issue body creation."""
         sonar_issue = SonarIssue(
             key="test-key",
@@ -287,8 +345,7 @@ class TestSyncEngine:
             tags=["security", "performance"]
         )
         
-        sync_engine = SyncEngine(self.config)
-        body = sync_engine._create_github_issue_body(sonar_issue)
+        body = engine._create_github_issue_body(sonar_issue)
         
         assert "**SonarCloud Issue:** test-key" in body
         assert "**Type:** BUG" in body
@@ -299,8 +356,14 @@ class TestSyncEngine:
         assert "**Tags:** security, performance" in body
         assert sonar_issue.url in body
         assert "*This issue was automatically created from SonarCloud*" in body
+        assert body.endswith(
+            f"**SonarCloud Link:** {sonar_issue.url}\n"
+            "**Tags:** security, performance\n"
+            "\n\n---\n"
+            "*This issue was automatically created from SonarCloud*"
+        )
     
-    def test_create_github_issue_body_no_tags(self):
+    def test_create_github_issue_body_no_tags(self, engine):
         """Test GitHub issue body creation without tags."""
         sonar_issue = SonarIssue(
             key="test-key",
@@ -313,52 +376,34 @@ class TestSyncEngine:
             tags=[]
         )
         
-        sync_engine = SyncEngine(self.config)
-        body = sync_engine._create_github_issue_body(sonar_issue)
+        body = engine._create_github_issue_body(sonar_issue)
         
         assert "**Tags:**" not in body
     
-    def test_extract_sonar_issue_key_success(self):
+    @pytest.mark.parametrize("body,expected", [
+        pytest.param(
+            "\n    Some content\n    **SonarCloud Issue:** test-issue-key-123\n    More content\n",
+            "test-issue-key-123",
+            id="success"
+        ),
+        pytest.param("Some content without SonarCloud issue key", None, id="not-found"),
+        # Only the exact marker counts; links and loose mentions are left to the duplicate index
+        pytest.param(UNMARKED_BODIES[0], None, id="link-only"),
+        pytest.param(UNMARKED_BODIES[2], None, id="loose-marker"),
+        # The key is found even when the marker isn't near the top of the body
+        pytest.param(
+            "Triage notes\n" * 100 + "**SonarCloud Issue:** moved-key-1\n", "moved-key-1",
+            id="after-long-preamble"
+        ),
+    ])
+    def test_extract_sonar_issue_key(self, engine, body, expected):
         """Test extracting SonarCloud issue key from GitHub body."""
-        body = """
-        Some content
-        **SonarCloud Issue:** test-issue-key-123
-        More content
-        """
-        
-        sync_engine = SyncEngine(self.config)
-        key = sync_engine._extract_sonar_issue_key(body)
-        
-        assert key == "test-issue-key-123"
+        assert engine._extract_sonar_issue_key(body) == expected
     
-    def test_extract_sonar_issue_key_not_found(self):
-        """Test extracting SonarCloud issue key when not found."""
-        body = "Some content without SonarCloud issue key"
-        
-        sync_engine = SyncEngine(self.config)
-        key = sync_engine._extract_sonar_issue_key(body)
-        
-        assert key is None
-    
-    @patch('sonarcloud_github_sync.sync.SonarClient')
-    @patch('sonarcloud_github_sync.sync.GitHubClient')
-    def test_full_sync_integration(self, mock_github_client, mock_sonar_client):
+    def test_full_sync_integration(self, make_engine, mocked_clients):
         """Test full sync integration."""
-        mock_sonar_instance = Mock()
-        mock_github_instance = Mock()
-        mock_sonar_client.return_value = mock_sonar_instance
-        mock_github_client.return_value = mock_github_instance
-        
-        # Mock credential validation
-        mock_sonar_instance.test_connection.return_value = True
-        mock_github_instance.test_connection.return_value = True
-        
-        # Mock SonarCloud sync
-        mock_sonar_instance.get_issues.return_value = []
-        mock_github_instance.get_issues_with_label.return_value = []
-        mock_github_instance.issue_exists_with_sonar_link.return_value = None
-        
-        sync_engine = SyncEngine(self.config)
+        # mocked_clients passes credential validation; both sync phases are patched out below
+        sync_engine = make_engine()
         
         with patch.object(sync_engine, 'sync_sonar_to_github') as mock_s2g:
             with patch.object(sync_engine, 'sync_github_to_sonar') as mock_g2s:
@@ -370,4 +415,6 @@ class TestSyncEngine:
                 assert results["created"] == 1
                 assert results["marked_wont_fix"] == 1
                 mock_s2g.assert_called_once()
-                mock_g2s.assert_called_once()
\ No newline at end of file
+                mock_g2s.assert_called_once()
+                # Both phases share the single issue listing fetched by full_sync
+                assert mock_s2g.call_args.args[0] is mock_g2s.call_args.args[0]
\ No newline at end of file